@@ -83,7 +83,18 @@ class DoomguyFaceEngine:
         if h < self._last_health and (self._last_health - h) >= self._OUCH_DAMAGE_THRESHOLD:
             self.notify_damage(self._last_health - h)
         self._last_health = h
+        return self._advance(h)
 
+    def tick(self) -> FaceState:
+        """Advance look and pain at the last known health, without a new health reading.
+
+        Use this when the relay reports the health estimate as unchanged, so the look
+        cycle keeps running and pain pulses still expire.
+        """
+
+        return self._advance(self._last_health)
+
+    def _advance(self, h: int) -> FaceState:
         look = self._LOOK_SEQUENCE[self._look_cursor]
         self._look_cursor = (self._look_cursor + 1) % len(self._LOOK_SEQUENCE)
 
@@ -0,0 +1,302 @@
+"""Live calibration preview for `obs_to_overlay_debug.py`.
+
+Instead of re-encoding a full-canvas `debug_last_frame.png` on every capture,
+the debugger can push annotated frames to a small MJPEG server:
+
+    GET  /                 page with the live preview and a "Save PNG" button
+    GET  /preview.mjpg     multipart/x-mixed-replace JPEG stream
+    POST /save             write the latest full-resolution annotation to disk
+
+Frames are cropped to the profile's gauge/anchor region and scaled down before
+JPEG encoding. The overlay shows live health and confidence per gauge, and the
+per-strip (line mode) or per-column (ROI mode) fill classification: green =
+filled, red = empty.
+
+Dependencies:
+    pip install opencv-python numpy
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from examples.hud_gauges import (
+    ROI_COLUMN_THRESHOLD,
+    GaugeEstimators,
+    convert_hsv_region,
+    estimate_line_from_profile,
+    gauge_bounds,
+    line_fill_profile,
+    line_sample_points,
+)
+
+FILLED_BGR = (0, 255, 0)
+EMPTY_BGR = (0, 0, 255)
+MARKER_BGR = (255, 0, 255)
+ANCHOR_BGR = (0, 255, 255)
+
+PREVIEW_PAGE = b"""<!doctype html>
+<html>
+  <head><meta charset="utf-8" /><title>Doomguy calibration preview</title></head>
+  <body style="background:#222;color:#ddd;font-family:sans-serif">
+    <img src="/preview.mjpg" style="image-rendering:pixelated;max-width:100%" />
+    <p>
+      <button onclick="fetch('/save', {method: 'POST'}).then(r => r.text()).then(t => msg.textContent = t)">
+        Save PNG
+      </button>
+      <span id="msg"></span>
+    </p>
+  </body>
+</html>
+"""
+
+
+def preview_region(
+    frame_shape: tuple[int, ...], gauges: dict[str, dict], profile: dict, margin: int = 40
+) -> tuple[int, int, int, int]:
+    """Box `(x0, y0, x1, y1)` covering every gauge and the HUD anchor, plus a margin."""
+
+    boxes = [gauge_bounds(g) for g in gauges.values()]
+    anchor = profile.get("hud_anchor")
+    if isinstance(anchor, dict) and "x" in anchor and "y" in anchor:
+        ax, ay = int(anchor["x"]), int(anchor["y"])
+        boxes.append((ax, ay, ax + 1, ay + 1))
+    frame_h, frame_w = frame_shape[:2]
+    x0 = max(0, min(b[0] for b in boxes) - margin)
+    y0 = max(0, min(b[1] for b in boxes) - margin)
+    x1 = min(frame_w, max(b[2] for b in boxes) + margin)
+    y1 = min(frame_h, max(b[3] for b in boxes) + margin)
+    if x1 <= x0 or y1 <= y0:
+        return 0, 0, frame_w, frame_h
+    return x0, y0, x1, y1
+
+
+def annotate_frame(
+    frame_bgr: np.ndarray,
+    gauges: dict[str, dict],
+    profile: dict,
+    region: tuple[int, int, int, int] | None = None,
+    estimators: GaugeEstimators | None = None,
+) -> np.ndarray:
+    """Draw gauge geometry, fill classification, live estimates and the HUD anchor.
+
+    Only `region` (default: whole frame) is copied and annotated, so live
+    previews never touch full-canvas pixels outside the calibrated area.
+    Each gauge's fill profile is computed once and drives both the drawing and
+    the estimate; pass long-lived `estimators` to reuse ROI buffers across frames.
+    """
+
+    estimators = estimators or GaugeEstimators(gauges)
+    x0, y0, x1, y1 = region or (0, 0, frame_bgr.shape[1], frame_bgr.shape[0])
+    dbg = frame_bgr[y0:y1, x0:x1].copy()
+    frame_hsv, origin = convert_hsv_region(frame_bgr, gauges)
+
+    def at(x: float, y: float) -> tuple[int, int]:
+        return int(round(x)) - x0, int(round(y)) - y0
+
+    for name, gauge in gauges.items():
+        roi_estimator = estimators.roi_estimator(name)
+        if roi_estimator is None:
+            start = at(gauge["bar_start"]["x"], gauge["bar_start"]["y"])
+            end = at(gauge["bar_end"]["x"], gauge["bar_end"]["y"])
+            cv2.line(dbg, start, end, MARKER_BGR, 1)
+            points = line_sample_points(gauge)
+            filled = line_fill_profile(frame_hsv, origin, gauge)
+            health, confidence = estimate_line_from_profile(filled, gauge)
+            if points is not None and filled is not None:
+                for (px, py), is_filled in zip(points, filled):
+                    cv2.circle(dbg, at(px, py), 1, FILLED_BGR if is_filled else EMPTY_BGR, -1)
+            cv2.circle(dbg, start, 4, (0, 255, 0), -1)
+            cv2.circle(dbg, end, 4, (0, 0, 255), -1)
+            label_at = (start[0], max(15, start[1] - 12))
+        else:
+            roi = gauge["health_roi"]
+            x, y = at(roi["x"], roi["y"])
+            w, h = int(roi["width"]), int(roi["height"])
+            cv2.rectangle(dbg, (x, y), (x + w, y + h), MARKER_BGR, 1)
+            col_sum, col_h = roi_estimator.column_sums(frame_hsv, origin)
+            health, confidence = roi_estimator.estimate_from_sums(col_sum, col_h)
+            col_fill = col_sum / (255.0 * max(1, col_h))
+            strip_y0 = max(0, min(dbg.shape[0], y + h + 2))
+            strip = dbg[strip_y0 : strip_y0 + 4, max(0, x) : max(0, x) + len(col_fill)]
+            if strip.size:
+                colors = np.where(
+                    (col_fill[: strip.shape[1]] > ROI_COLUMN_THRESHOLD)[:, None],
+                    np.array(FILLED_BGR, dtype=np.uint8),
+                    np.array(EMPTY_BGR, dtype=np.uint8),
+                )
+                strip[:] = colors[None, :, :]
+            label_at = (x, max(15, y - 6))
+
+        cv2.putText(
+            dbg,
+            f"{name} {health:3d}% conf={confidence:.2f}",
+            label_at,
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.5,
+            MARKER_BGR,
+            1,
+            cv2.LINE_AA,
+        )
+
+    anchor = profile.get("hud_anchor")
+    if isinstance(anchor, dict):
+        ax, ay = int(anchor.get("x", -1)), int(anchor.get("y", -1))
+        if 0 <= ay < frame_bgr.shape[0] and 0 <= ax < frame_bgr.shape[1]:
+            sampled = frame_bgr[ay, ax].tolist()
+            cv2.circle(dbg, at(ax, ay), 4, ANCHOR_BGR, -1)
+            cv2.putText(
+                dbg,
+                f"HUD anchor BGR={sampled}",
+                (max(5, ax - x0 + 10), max(20, ay - y0 - 10)),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.5,
+                ANCHOR_BGR,
+                1,
+                cv2.LINE_AA,
+            )
+    return dbg
+
+
+def render_preview(annotated: np.ndarray, max_width: int, jpeg_quality: int = 80) -> bytes:
+    """Scale an annotated crop to at most `max_width` and JPEG-encode it."""
+
+    crop = annotated
+    if max_width > 0 and crop.shape[1] > max_width:
+        scale = max_width / crop.shape[1]
+        crop = cv2.resize(crop, (max_width, max(1, int(crop.shape[0] * scale))), interpolation=cv2.INTER_AREA)
+    ok, jpeg = cv2.imencode(".jpg", crop, [cv2.IMWRITE_JPEG_QUALITY, int(jpeg_quality)])
+    if not ok:
+        raise RuntimeError("JPEG encoding failed")
+    return jpeg.tobytes()
+
+
+class PreviewServer:
+    """Serves the latest preview JPEG as MJPEG and saves PNGs only on request.
+
+    `annotate_full` renders the full-canvas annotation for `/save`; it only runs
+    when a save is requested.
+    """
+
+    def __init__(
+        self, host: str, port: int, save_path: Path, annotate_full: Callable[[np.ndarray], np.ndarray]
+    ) -> None:
+        self.save_path = save_path
+        self._annotate_full = annotate_full
+        self._cond = threading.Condition()
+        self._jpeg = b""
+        self._seq = 0
+        self._full: np.ndarray | Callable[[], np.ndarray | None] | None = None
+        self._closed = False
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> None:
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def push(self, jpeg: bytes, frame_bgr: np.ndarray | Callable[[], np.ndarray | None]) -> None:
+        """Publish a new preview frame and what `/save` should annotate.
+
+        `frame_bgr` is either a frame the caller will not modify afterwards, or a
+        callable that fetches one only when a save is requested (returning None
+        if it is no longer available), so shared frame-bus views never need a
+        full-canvas copy per tick.
+        """
+
+        with self._cond:
+            self._jpeg = jpeg
+            self._full = frame_bgr
+            self._seq += 1
+            self._cond.notify_all()
+
+    def save(self) -> Path | None:
+        with self._cond:
+            full = self._full
+        if callable(full):
+            full = full()
+        if full is None:
+            return None
+        cv2.imwrite(str(self.save_path), self._annotate_full(full))
+        return self.save_path
+
+    def _next_jpeg(self, after_seq: int, timeout: float = 5.0) -> tuple[int, bytes] | None:
+        with self._cond:
+            self._cond.wait_for(lambda: self._closed or self._seq > after_seq, timeout=timeout)
+            if self._closed:
+                return None
+            return self._seq, self._jpeg
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        preview = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+                pass
+
+            def _send_bytes(self, code: int, data: bytes, content_type: str) -> None:
+                self.send_response(code)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self) -> None:  # noqa: N802
+                if self.path in {"/", "/index.html"}:
+                    self._send_bytes(HTTPStatus.OK, PREVIEW_PAGE, "text/html; charset=utf-8")
+                    return
+                if self.path != "/preview.mjpg":
+                    self._send_bytes(HTTPStatus.NOT_FOUND, b"not found", "text/plain")
+                    return
+
+                self.send_response(HTTPStatus.OK)
+                self.send_header("Content-Type", "multipart/x-mixed-replace; boundary=frame")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                seq = 0
+                try:
+                    while True:
+                        nxt = preview._next_jpeg(seq)
+                        if nxt is None:
+                            return
+                        if nxt[0] == seq:
+                            continue
+                        seq, jpeg = nxt
+                        self.wfile.write(
+                            b"--frame\r\nContent-Type: image/jpeg\r\n"
+                            + f"Content-Length: {len(jpeg)}\r\n\r\n".encode("ascii")
+                            + jpeg
+                            + b"\r\n"
+                        )
+                except (BrokenPipeError, ConnectionResetError):
+                    return
+
+            def do_POST(self) -> None:  # noqa: N802
+                if self.path != "/save":
+                    self._send_bytes(HTTPStatus.NOT_FOUND, b"not found", "text/plain")
+                    return
+                saved = preview.save()
+                if saved is None:
+                    self._send_bytes(HTTPStatus.CONFLICT, b"no frame available yet, try again", "text/plain")
+                    return
+                self._send_bytes(HTTPStatus.OK, f"saved {saved}".encode("utf-8"), "text/plain")
+
+        return Handler
@@ -0,0 +1,183 @@
+"""Shared-memory frame bus: one capture process, many zero-copy readers.
+
+The capture daemon (`examples/obs_capture_daemon.py`) owns the OBS connection and
+publishes every decoded BGR frame into a `multiprocessing.shared_memory` ring
+buffer. The relay, the calibration debugger and any extra estimator process
+attach as readers, so adding a consumer never adds a screenshot request.
+
+Segment layout (all int64 control words, then pixel slots):
+
+    ctrl[0..3]   magic, slot count, max height, max width
+    ctrl[4]      latest published sequence number (0 = nothing yet)
+    ctrl[8 + 4*i .. 8 + 4*i + 3]
+                 slot i: sequence, timestamp_ms, height, width
+    slot i pixels: max_height x max_width x 3 uint8
+
+Frame `seq` lands in slot `seq % slots`. The writer clears the slot sequence
+before copying pixels and sets it afterwards, so readers can detect a torn or
+recycled slot by comparing sequence numbers.
+
+Dependencies:
+    pip install numpy
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+DEFAULT_BUS_NAME = "doomguy-frames"
+
+_MAGIC = 0x44474642_55530001  # "DGFBUS" + layout version 1
+_CHANNELS = 3
+_HEADER_WORDS = 8
+_SLOT_WORDS = 4
+_LATEST = 4
+
+
+@dataclass(frozen=True)
+class BusFrame:
+    """A frame view into shared memory. Valid until its slot is recycled."""
+
+    seq: int
+    timestamp_ms: int
+    image: np.ndarray
+
+
+def _ctrl_words(slots: int) -> int:
+    return _HEADER_WORDS + slots * _SLOT_WORDS
+
+
+class _FrameBus:
+    def __init__(self, shm: shared_memory.SharedMemory) -> None:
+        self._shm = shm
+        header = np.ndarray((_HEADER_WORDS,), dtype=np.int64, buffer=shm.buf)
+        if int(header[0]) != _MAGIC:
+            raise ValueError(f"Shared memory '{shm.name}' is not a Doomguy frame bus")
+        self.slots = int(header[1])
+        self.max_height = int(header[2])
+        self.max_width = int(header[3])
+        del header
+
+        n_ctrl = _ctrl_words(self.slots)
+        self._ctrl = np.ndarray((n_ctrl,), dtype=np.int64, buffer=shm.buf)
+        self._meta = self._ctrl[_HEADER_WORDS:].reshape(self.slots, _SLOT_WORDS)
+        self._pixels = np.ndarray(
+            (self.slots, self.max_height, self.max_width, _CHANNELS),
+            dtype=np.uint8,
+            buffer=shm.buf,
+            offset=n_ctrl * 8,
+        )
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def latest_seq(self) -> int:
+        return int(self._ctrl[_LATEST])
+
+    def close(self) -> None:
+        # Views must be released before the mapping can be closed.
+        del self._ctrl, self._meta, self._pixels
+        self._shm.close()
+
+
+class FrameBusWriter(_FrameBus):
+    """Creates the bus segment and publishes frames into it."""
+
+    def __init__(self, name: str, max_width: int, max_height: int, slots: int = 4) -> None:
+        slots = max(2, int(slots))
+        size = _ctrl_words(slots) * 8 + slots * max_height * max_width * _CHANNELS
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError as exc:
+            raise RuntimeError(
+                f"Frame bus '{name}' already exists. Is another capture daemon running? "
+                "Pick another --bus-name or stop the other daemon."
+            ) from exc
+
+        header = np.ndarray((_HEADER_WORDS,), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[1:4] = (slots, max_height, max_width)
+        header[0] = _MAGIC
+        del header
+        super().__init__(shm)
+        self._meta[:] = 0
+
+    def publish(self, frame_bgr: np.ndarray, timestamp_ms: int | None = None) -> int:
+        """Copy a BGR frame into the next slot and return its sequence number."""
+
+        h, w = frame_bgr.shape[:2]
+        if h > self.max_height or w > self.max_width or frame_bgr.shape[2:] != (_CHANNELS,):
+            raise ValueError(
+                f"Frame {w}x{h} does not fit bus capacity {self.max_width}x{self.max_height}x{_CHANNELS}"
+            )
+
+        seq = self.latest_seq + 1
+        meta = self._meta[seq % self.slots]
+        meta[0] = 0
+        self._pixels[seq % self.slots, :h, :w] = frame_bgr
+        meta[1:4] = (int(time.time() * 1000) if timestamp_ms is None else timestamp_ms, h, w)
+        meta[0] = seq
+        self._ctrl[_LATEST] = seq
+        return seq
+
+    def unlink(self) -> None:
+        self._shm.unlink()
+
+
+class FrameBusReader(_FrameBus):
+    """Attaches to an existing bus and hands out zero-copy frame views."""
+
+    def __init__(self, name: str) -> None:
+        # Readers do not own the segment; keep the resource tracker from
+        # unlinking it when this process exits.
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:  # Python < 3.13 has no `track` and always registers.
+            register = resource_tracker.register
+            resource_tracker.register = lambda *_args, **_kwargs: None
+            try:
+                shm = shared_memory.SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+        super().__init__(shm)
+
+    def read_latest(self) -> BusFrame | None:
+        """Return the newest complete frame, or None if nothing was published yet."""
+
+        for _ in range(self.slots):
+            seq = self.latest_seq
+            if seq <= 0:
+                return None
+            meta = self._meta[seq % self.slots]
+            if int(meta[0]) != seq:
+                continue  # writer is refilling this slot; re-read latest
+            ts, h, w = (int(v) for v in meta[1:4])
+            image = self._pixels[seq % self.slots, :h, :w]
+            image.flags.writeable = False
+            if int(meta[0]) == seq:
+                return BusFrame(seq=seq, timestamp_ms=ts, image=image)
+        return None
+
+    def is_valid(self, frame: BusFrame) -> bool:
+        """True while the frame's slot has not been recycled by the writer."""
+
+        return int(self._meta[frame.seq % self.slots][0]) == frame.seq
+
+    def wait_next(self, after_seq: int, timeout: float = 1.0, poll_interval: float = 0.002) -> BusFrame | None:
+        """Block until a frame newer than `after_seq` is published, or timeout."""
+
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.latest_seq > after_seq:
+                frame = self.read_latest()
+                if frame is not None and frame.seq > after_seq:
+                    return frame
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(poll_interval)
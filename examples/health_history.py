@@ -0,0 +1,190 @@
+"""Fixed-capacity health/frame history for the overlay server.
+
+Keeps the last `capacity` resolved states in parallel typed arrays (stdlib
+`array`), so memory stays constant no matter how long the server runs:
+
+    timestamp_ms q   server wall clock when the sample was applied
+    health       B   0-100
+    bucket       B   engine health bucket
+    frame_id     H   index into `frame_names`
+    pain         B   1 while STFOUCHx is shown
+    visible      B   hud_anchor_visible
+    confidence   f   relay confidence (1.0 when the relay sent none)
+
+Ranges can be read back as JSON-ready dicts, as packed binary records
+(`RECORD_STRUCT`), or downsampled into per-bucket min/max/mean summaries.
+
+Range lookups bisect over timestamps, so `append` never stores a timestamp
+older than the previous record: a wall-clock step backwards is recorded as a
+run of equal timestamps instead.
+"""
+
+from __future__ import annotations
+
+import bisect
+import struct
+from array import array
+
+RECORD_STRUCT = struct.Struct("<qBBHBBf")
+
+
+class _Timeline:
+    """Chronological read-only view of the timestamp ring, for `bisect`."""
+
+    def __init__(self, history: HealthHistory) -> None:
+        self._history = history
+
+    def __len__(self) -> int:
+        return self._history.size
+
+    def __getitem__(self, i: int) -> int:
+        return self._history.timestamp_ms[self._history.slot(i)]
+
+
+class HealthHistory:
+    """Ring buffer of resolved face states. Not thread-safe; callers lock."""
+
+    def __init__(self, capacity: int = 6000) -> None:
+        self.capacity = max(1, int(capacity))
+        self.timestamp_ms = array("q", bytes(8 * self.capacity))
+        self.health = array("B", bytes(self.capacity))
+        self.bucket = array("B", bytes(self.capacity))
+        self.frame_id = array("H", bytes(2 * self.capacity))
+        self.pain = array("B", bytes(self.capacity))
+        self.visible = array("B", bytes(self.capacity))
+        self.confidence = array("f", bytes(4 * self.capacity))
+        self.frame_names: list[str] = []
+        self._frame_index: dict[str, int] = {}
+        self.size = 0
+        self._next = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def slot(self, i: int) -> int:
+        """Ring slot of the i-th oldest record."""
+
+        return (self._next - self.size + i) % self.capacity
+
+    def append(
+        self,
+        timestamp_ms: int,
+        health_percent: int,
+        health_bucket: int,
+        frame: str,
+        is_pain: bool,
+        hud_anchor_visible: bool,
+        confidence: float,
+    ) -> None:
+        frame_id = self._frame_index.get(frame)
+        if frame_id is None:
+            frame_id = self._frame_index[frame] = len(self.frame_names)
+            self.frame_names.append(frame)
+
+        i = self._next
+        if self.size:
+            timestamp_ms = max(int(timestamp_ms), self.timestamp_ms[(i - 1) % self.capacity])
+        self.timestamp_ms[i] = int(timestamp_ms)
+        self.health[i] = max(0, min(100, int(health_percent)))
+        self.bucket[i] = int(health_bucket)
+        self.frame_id[i] = frame_id
+        self.pain[i] = 1 if is_pain else 0
+        self.visible[i] = 1 if hud_anchor_visible else 0
+        self.confidence[i] = float(confidence)
+        self._next = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def index_range(self, since_ms: int | None = None, until_ms: int | None = None) -> range:
+        """Chronological positions with `since_ms <= timestamp_ms <= until_ms`."""
+
+        timeline = _Timeline(self)
+        lo = 0 if since_ms is None else bisect.bisect_left(timeline, since_ms)
+        hi = self.size if until_ms is None else bisect.bisect_right(timeline, until_ms)
+        return range(lo, max(lo, hi))
+
+    def records(self, since_ms: int | None = None, until_ms: int | None = None) -> list[dict]:
+        out = []
+        for i in self.index_range(since_ms, until_ms):
+            s = self.slot(i)
+            out.append(
+                {
+                    "timestamp_ms": self.timestamp_ms[s],
+                    "health_percent": self.health[s],
+                    "health_bucket": self.bucket[s],
+                    "frame": self.frame_names[self.frame_id[s]],
+                    "is_pain": bool(self.pain[s]),
+                    "hud_anchor_visible": bool(self.visible[s]),
+                    "confidence": round(self.confidence[s], 3),
+                }
+            )
+        return out
+
+    def to_bytes(self, since_ms: int | None = None, until_ms: int | None = None) -> bytes:
+        """Pack a range as consecutive `RECORD_STRUCT` records (frame ids index `frame_names`)."""
+
+        positions = self.index_range(since_ms, until_ms)
+        buf = bytearray(RECORD_STRUCT.size * len(positions))
+        for n, i in enumerate(positions):
+            s = self.slot(i)
+            RECORD_STRUCT.pack_into(
+                buf,
+                n * RECORD_STRUCT.size,
+                self.timestamp_ms[s],
+                self.health[s],
+                self.bucket[s],
+                self.frame_id[s],
+                self.pain[s],
+                self.visible[s],
+                self.confidence[s],
+            )
+        return bytes(buf)
+
+    def summary(self, buckets: int, since_ms: int | None = None, until_ms: int | None = None) -> list[dict]:
+        """Downsample a range into `buckets` equal time slices with min/max/mean health.
+
+        Slices are at least 1 ms wide, so short ranges get fewer than `buckets`.
+        Empty slices are omitted.
+        """
+
+        positions = self.index_range(since_ms, until_ms)
+        if not positions or buckets <= 0:
+            return []
+        start = self.timestamp_ms[self.slot(positions[0])] if since_ms is None else since_ms
+        end = self.timestamp_ms[self.slot(positions[-1])] if until_ms is None else until_ms
+        span = max(1, end - start + 1)
+        buckets = min(buckets, span)
+
+        acc: dict[int, list] = {}
+        for i in positions:
+            s = self.slot(i)
+            b = min(buckets - 1, (self.timestamp_ms[s] - start) * buckets // span)
+            h = self.health[s]
+            entry = acc.get(b)
+            if entry is None:
+                acc[b] = [1, h, h, h, self.confidence[s], self.pain[s], self.visible[s]]
+            else:
+                entry[0] += 1
+                entry[1] = min(entry[1], h)
+                entry[2] = max(entry[2], h)
+                entry[3] += h
+                entry[4] += self.confidence[s]
+                entry[5] += self.pain[s]
+                entry[6] += self.visible[s]
+
+        out = []
+        for b in sorted(acc):
+            count, h_min, h_max, h_sum, c_sum, pain, visible = acc[b]
+            out.append(
+                {
+                    "start_ms": start + b * span // buckets,
+                    "end_ms": start + (b + 1) * span // buckets - 1,
+                    "count": count,
+                    "health_min": h_min,
+                    "health_max": h_max,
+                    "health_mean": round(h_sum / count, 2),
+                    "confidence_mean": round(c_sum / count, 3),
+                    "pain_samples": pain,
+                    "visible_ratio": round(visible / count, 3),
+                }
+            )
+        return out
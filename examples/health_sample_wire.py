@@ -0,0 +1,130 @@
+"""Compact binary health-sample format for the UDP ingest path.
+
+Each datagram is one fixed little-endian struct (23 bytes):
+
+    magic        2s   b"DG"
+    version      B    1
+    flags        B    bit 0 = hud_anchor_visible, bit 1 = heartbeat (state unchanged)
+    channel      H    sender/game channel
+    sequence     I    per-channel counter, wraps at 2**32
+    timestamp_ms q    relay wall clock
+    health       B    0-100
+    confidence   f    0.0-1.0
+
+The server never parses JSON for these samples, and `SequenceFilter` drops
+datagrams that arrive out of order.
+"""
+
+from __future__ import annotations
+
+import struct
+import time
+from dataclasses import dataclass
+
+SAMPLE_MAGIC = b"DG"
+SAMPLE_VERSION = 1
+SAMPLE_STRUCT = struct.Struct("<2sBBHIqBf")
+
+FLAG_HUD_ANCHOR_VISIBLE = 0x01
+FLAG_HEARTBEAT = 0x02
+
+_SEQ_MOD = 1 << 32
+
+
+@dataclass(frozen=True)
+class BinarySample:
+    channel: int
+    sequence: int
+    timestamp_ms: int
+    health_percent: int
+    confidence: float
+    flags: int
+
+    @property
+    def hud_anchor_visible(self) -> bool:
+        return bool(self.flags & FLAG_HUD_ANCHOR_VISIBLE)
+
+    @property
+    def is_heartbeat(self) -> bool:
+        return bool(self.flags & FLAG_HEARTBEAT)
+
+
+def pack_sample(
+    channel: int,
+    sequence: int,
+    timestamp_ms: int,
+    health_percent: int,
+    confidence: float,
+    hud_anchor_visible: bool = True,
+    flags: int = 0,
+) -> bytes:
+    """Encode one sample. Health is clamped to 0-100, sequence wraps at 2**32."""
+
+    if hud_anchor_visible:
+        flags |= FLAG_HUD_ANCHOR_VISIBLE
+    return SAMPLE_STRUCT.pack(
+        SAMPLE_MAGIC,
+        SAMPLE_VERSION,
+        flags & 0xFF,
+        channel & 0xFFFF,
+        sequence % _SEQ_MOD,
+        int(timestamp_ms),
+        max(0, min(100, int(health_percent))),
+        float(confidence),
+    )
+
+
+def unpack_sample(data: bytes) -> BinarySample:
+    """Decode one datagram; raises ValueError for foreign or malformed packets."""
+
+    if len(data) != SAMPLE_STRUCT.size:
+        raise ValueError(f"expected {SAMPLE_STRUCT.size} bytes, got {len(data)}")
+    magic, version, flags, channel, sequence, timestamp_ms, health, confidence = SAMPLE_STRUCT.unpack(data)
+    if magic != SAMPLE_MAGIC or version != SAMPLE_VERSION:
+        raise ValueError(f"unsupported sample header {magic!r} v{version}")
+    return BinarySample(
+        channel=channel,
+        sequence=sequence,
+        timestamp_ms=timestamp_ms,
+        health_percent=min(100, health),
+        confidence=confidence,
+        flags=flags,
+    )
+
+
+def initial_sequence(now_ms: int | None = None) -> int:
+    """First sequence number for a new sender session: the wall clock in ms, wrapped.
+
+    A sender that sends at most one sample per millisecond stays behind the
+    clock. So a restarted relay starts ahead of everything its previous run
+    sent, and the server never mistakes the new run for stale packets.
+    """
+
+    if now_ms is None:
+        now_ms = int(time.time() * 1000)
+    return now_ms % _SEQ_MOD
+
+
+class SequenceFilter:
+    """Accept only samples newer than the last accepted one on the same channel.
+
+    Uses serial-number arithmetic so the 32-bit counter may wrap. A sample that
+    is more than `restart_window` behind is treated as a restarted sender and
+    accepted. Senders also start each session at `initial_sequence()`, so a
+    restart after a short run lands ahead of the old counter instead of inside
+    the window.
+    """
+
+    def __init__(self, restart_window: int = 1024) -> None:
+        self._restart_window = restart_window
+        self._last: dict[int, int] = {}
+
+    def accept(self, channel: int, sequence: int) -> bool:
+        last = self._last.get(channel)
+        if last is not None:
+            ahead = (sequence - last) % _SEQ_MOD
+            behind = (last - sequence) % _SEQ_MOD
+            if ahead == 0 or (ahead >= _SEQ_MOD // 2 and behind <= self._restart_window):
+                return False
+        self._last[channel] = sequence
+        return True
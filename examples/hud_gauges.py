@@ -0,0 +1,368 @@
+"""Shared HUD gauge sampling helpers for the OBS relay scripts.
+
+A profile can declare several named gauges (health, armor, shields, ...). Each
+gauge has its own geometry, HSV bounds and direction:
+
+    "gauges": {
+      "health": { "health_roi": {...}, "fill_color_hsv": {...}, "direction": "left_to_right" },
+      "armor":  { "sampling_mode": "line", "bar_start": {...}, "bar_end": {...}, ... }
+    }
+
+Profiles without `gauges` keep working: their top-level bar fields become a
+single implicit gauge named `health`.
+
+All gauges of one captured frame are estimated from one decode and one shared
+BGR->HSV conversion of the region that covers every gauge.
+
+Dependencies:
+    pip install opencv-python numpy
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+PRIMARY_GAUGE = "health"
+
+# Fraction of an ROI column that must match the fill color to count as filled.
+ROI_COLUMN_THRESHOLD = 0.25
+
+# Keys copied from a legacy single-bar profile into its implicit `health` gauge.
+_GAUGE_KEYS = (
+    "sampling_mode",
+    "health_roi",
+    "bar_start",
+    "bar_end",
+    "bar_thickness",
+    "line_samples",
+    "fill_color_hsv",
+    "direction",
+    "subpixel_edge",
+)
+
+
+def clamp_health(value: float) -> int:
+    return int(max(0, min(100, round(value))))
+
+
+def decode_obs_data_url(data_url: str) -> np.ndarray:
+    # Format: data:image/png;base64,AAAA...
+    b64 = data_url.split(",", 1)[1]
+    raw = base64.b64decode(b64)
+    arr = np.frombuffer(raw, dtype=np.uint8)
+    bgr = cv2.imdecode(arr, cv2.IMREAD_COLOR)
+    return bgr
+
+
+def load_profile(path: Path, profile_id: str) -> dict:
+    obj = json.loads(path.read_text())
+    for p in obj.get("profiles", []):
+        if p.get("id") == profile_id:
+            return p
+    ids = [p.get("id") for p in obj.get("profiles", [])]
+    raise ValueError(f"Profile '{profile_id}' not found. Available: {ids}")
+
+
+def resolve_gauges(profile: dict) -> dict[str, dict]:
+    """Return the named gauges of a profile, in declaration order.
+
+    Legacy profiles (no `gauges` key) yield a single `health` gauge built from
+    the top-level bar fields.
+    """
+
+    gauges = profile.get("gauges")
+    if isinstance(gauges, dict) and gauges:
+        return {str(name): gauge for name, gauge in gauges.items() if isinstance(gauge, dict)}
+    return {PRIMARY_GAUGE: {k: profile[k] for k in _GAUGE_KEYS if k in profile}}
+
+
+def primary_gauge_name(gauges: dict[str, dict]) -> str:
+    """Gauge reported as `health_percent`: `health` if declared, else the first one."""
+
+    if PRIMARY_GAUGE in gauges:
+        return PRIMARY_GAUGE
+    return next(iter(gauges))
+
+
+def gauge_bounds(gauge: dict) -> tuple[int, int, int, int]:
+    """Return the pixel box `(x0, y0, x1, y1)` (exclusive end) a gauge reads from."""
+
+    if gauge.get("sampling_mode", "roi") == "line":
+        sx, sy = float(gauge["bar_start"]["x"]), float(gauge["bar_start"]["y"])
+        ex, ey = float(gauge["bar_end"]["x"]), float(gauge["bar_end"]["y"])
+        pad = max(1, int(gauge.get("bar_thickness", 5)) // 2) + 1
+        return (
+            int(np.floor(min(sx, ex))) - pad,
+            int(np.floor(min(sy, ey))) - pad,
+            int(np.ceil(max(sx, ex))) + pad + 1,
+            int(np.ceil(max(sy, ey))) + pad + 1,
+        )
+
+    roi = gauge["health_roi"]
+    x, y, w, h = int(roi["x"]), int(roi["y"]), int(roi["width"]), int(roi["height"])
+    return x, y, x + w, y + h
+
+
+def convert_hsv_region(frame_bgr: np.ndarray, gauges: dict[str, dict]) -> tuple[np.ndarray, tuple[int, int]]:
+    """Convert the union of all gauge regions to HSV once.
+
+    Returns the HSV crop and its `(x, y)` origin in frame coordinates.
+    """
+
+    frame_h, frame_w = frame_bgr.shape[:2]
+    boxes = [gauge_bounds(g) for g in gauges.values()]
+    x0 = max(0, min(b[0] for b in boxes))
+    y0 = max(0, min(b[1] for b in boxes))
+    x1 = min(frame_w, max(b[2] for b in boxes))
+    y1 = min(frame_h, max(b[3] for b in boxes))
+    if x1 <= x0 or y1 <= y0:
+        return np.zeros((0, 0, 3), dtype=np.uint8), (0, 0)
+    return cv2.cvtColor(frame_bgr[y0:y1, x0:x1], cv2.COLOR_BGR2HSV), (x0, y0)
+
+
+class RoiGaugeEstimator:
+    """Rectangular-ROI estimator that reuses its buffers across frames.
+
+    One `inRange` into a preallocated mask and one column `reduce` into a
+    preallocated int32 row yield both the column fill profile and the overall
+    fill ratio (confidence), with no float mask copies or second pass.
+
+    With `"subpixel_edge": true` on the gauge, the bar edge is refined by the
+    partial coverage of the two columns around it, which gives narrow bars
+    finer health resolution than whole columns. Coverage is relative to the
+    bar's interior columns, so ROIs taller than the bar are fine. Only in-mask
+    pixels count: slanted or stepped edges gain resolution, while a straight
+    vertical edge whose blended column misses the HSV bounds stays whole-column.
+    """
+
+    def __init__(self, gauge: dict) -> None:
+        roi = gauge["health_roi"]
+        self.x, self.y = int(roi["x"]), int(roi["y"])
+        self.width, self.height = int(roi["width"]), int(roi["height"])
+        self.low = np.array(gauge["fill_color_hsv"]["low"], dtype=np.uint8)
+        self.high = np.array(gauge["fill_color_hsv"]["high"], dtype=np.uint8)
+        self.direction = gauge.get("direction", "left_to_right")
+        self.subpixel_edge = bool(gauge.get("subpixel_edge", False))
+        self._mask = np.empty((0, 0), dtype=np.uint8)
+        self._col_sum = np.empty((1, 0), dtype=np.int32)
+
+    def column_sums(self, frame_hsv: np.ndarray, origin: tuple[int, int]) -> tuple[np.ndarray, int]:
+        """Return per-column mask sums (filled pixels x 255) and the crop height.
+
+        The returned row is an internal buffer, overwritten by the next call.
+        """
+
+        x, y = self.x - origin[0], self.y - origin[1]
+        hsv = frame_hsv[max(0, y) : y + self.height, max(0, x) : x + self.width]
+        h, w = hsv.shape[:2]
+        if h == 0 or w == 0:
+            return self._col_sum[0, :0], 0
+        if self._mask.shape != (h, w):
+            self._mask = np.empty((h, w), dtype=np.uint8)
+            self._col_sum = np.empty((1, w), dtype=np.int32)
+        cv2.inRange(hsv, self.low, self.high, dst=self._mask)
+        cv2.reduce(self._mask, 0, cv2.REDUCE_SUM, dst=self._col_sum, dtype=cv2.CV_32S)
+        return self._col_sum[0], h
+
+    def estimate(self, frame_hsv: np.ndarray, origin: tuple[int, int]) -> tuple[int, float]:
+        return self.estimate_from_sums(*self.column_sums(frame_hsv, origin))
+
+    def estimate_from_sums(self, col_sum: np.ndarray, h: int) -> tuple[int, float]:
+        """Health and confidence from a `column_sums` result."""
+
+        if h == 0:
+            return 0, 0.0
+
+        # Project mask along bar direction: walk columns from the anchored end, so
+        # the moving edge is the farthest filled column (leftmost for right_to_left).
+        profile = col_sum[::-1] if self.direction == "right_to_left" else col_sum
+        col_thresh = ROI_COLUMN_THRESHOLD * h * 255
+        filled_cols = np.flatnonzero(profile > col_thresh)
+        if len(filled_cols) == 0:
+            return 0, 0.6
+
+        far = int(filled_cols[-1])
+        edge = float(far)
+        if self.subpixel_edge:
+            # Area-based refinement: a crisp edge stays at `far`; partial coverage
+            # of the edge column or its outer neighbour shifts it. Coverage is
+            # measured against a full interior column, not the ROI height.
+            interior = filled_cols[:-1] if len(filled_cols) > 1 else filled_cols
+            full = max(1.0, float(np.median(profile[interior])))
+            f0 = min(1.0, profile[far] / full)
+            f1 = min(1.0, profile[far + 1] / full) if far + 1 < len(profile) else 0.0
+            edge = min(float(self.width - 1), max(0.0, far - 1 + f0 + f1))
+        health = 100.0 * (edge / max(1, self.width - 1))
+
+        fill_ratio = float(col_sum.sum()) / (255.0 * h * len(col_sum))
+        confidence = float(max(0.0, min(1.0, fill_ratio * 1.5)))
+        return clamp_health(health), confidence
+
+
+def estimate_health_roi(frame_hsv: np.ndarray, origin: tuple[int, int], gauge: dict) -> tuple[int, float]:
+    return RoiGaugeEstimator(gauge).estimate(frame_hsv, origin)
+
+
+def sample_strip_hsv(frame_hsv: np.ndarray, center: np.ndarray, normal: np.ndarray, half_t: int) -> np.ndarray:
+    pts = []
+    for k in range(-half_t, half_t + 1):
+        p = center + normal * k
+        x = int(round(p[0]))
+        y = int(round(p[1]))
+        if 0 <= x < frame_hsv.shape[1] and 0 <= y < frame_hsv.shape[0]:
+            pts.append(frame_hsv[y, x])
+    if not pts:
+        return np.array([0, 0, 0], dtype=np.float32)
+    return np.mean(np.array(pts, dtype=np.float32), axis=0)
+
+
+def line_sample_points(gauge: dict) -> np.ndarray | None:
+    """Return the `line_samples` x 2 frame coordinates sampled along a line gauge.
+
+    Returns None when the bar is shorter than one pixel.
+    """
+
+    s = np.array([gauge["bar_start"]["x"], gauge["bar_start"]["y"]], dtype=np.float32)
+    e = np.array([gauge["bar_end"]["x"], gauge["bar_end"]["y"]], dtype=np.float32)
+    n_samples = int(gauge.get("line_samples", 200))
+    if float(np.linalg.norm(e - s)) < 1.0:
+        return None
+    t = np.arange(n_samples, dtype=np.float32) / max(1, n_samples - 1)
+    return s + (e - s) * t[:, None]
+
+
+def line_fill_profile(frame_hsv: np.ndarray, origin: tuple[int, int], gauge: dict) -> np.ndarray | None:
+    """Classify every line sample strip as filled (True) or empty (False)."""
+
+    points = line_sample_points(gauge)
+    if points is None:
+        return None
+    thickness = int(gauge.get("bar_thickness", 5))
+
+    v = np.array(
+        [gauge["bar_end"]["x"] - gauge["bar_start"]["x"], gauge["bar_end"]["y"] - gauge["bar_start"]["y"]],
+        dtype=np.float32,
+    )
+    u = v / float(np.linalg.norm(v))
+    n = np.array([-u[1], u[0]], dtype=np.float32)
+
+    low = np.array(gauge["fill_color_hsv"]["low"], dtype=np.float32)
+    high = np.array(gauge["fill_color_hsv"]["high"], dtype=np.float32)
+
+    half_t = max(1, thickness // 2)
+    offset = np.array(origin, dtype=np.float32)
+    filled = np.zeros(len(points), dtype=bool)
+
+    for i, p in enumerate(points):
+        hsv_avg = sample_strip_hsv(frame_hsv, p - offset, n, half_t)
+        filled[i] = np.all(hsv_avg >= low) and np.all(hsv_avg <= high)
+    return filled
+
+
+def estimate_health_line(frame_hsv: np.ndarray, origin: tuple[int, int], gauge: dict) -> tuple[int, float]:
+    return estimate_line_from_profile(line_fill_profile(frame_hsv, origin, gauge), gauge)
+
+
+def estimate_line_from_profile(filled: np.ndarray | None, gauge: dict) -> tuple[int, float]:
+    """Health and confidence from a `line_fill_profile` result."""
+
+    if filled is None:
+        return 0, 0.0
+    n_samples = len(filled)
+
+    filled_indices = np.flatnonzero(filled)
+    if len(filled_indices) == 0:
+        return 0, 0.55
+
+    direction = gauge.get("direction", "left_to_right")
+    if direction == "right_to_left":
+        first = int(filled_indices.min())
+        health = 100.0 * ((n_samples - 1 - first) / max(1, n_samples - 1))
+    else:
+        last = int(filled_indices.max())
+        health = 100.0 * (last / max(1, n_samples - 1))
+
+    confidence = float(filled.sum() / max(1, n_samples))
+    return clamp_health(health), confidence
+
+
+def estimate_gauge(frame_hsv: np.ndarray, origin: tuple[int, int], gauge: dict) -> tuple[int, float]:
+    if gauge.get("sampling_mode", "roi") == "line":
+        return estimate_health_line(frame_hsv, origin, gauge)
+    return estimate_health_roi(frame_hsv, origin, gauge)
+
+
+def estimate_gauges(frame_bgr: np.ndarray, gauges: dict[str, dict]) -> dict[str, tuple[int, float]]:
+    """Estimate every gauge from one frame with a single shared HSV conversion."""
+
+    frame_hsv, origin = convert_hsv_region(frame_bgr, gauges)
+    return {name: estimate_gauge(frame_hsv, origin, gauge) for name, gauge in gauges.items()}
+
+
+class GaugeEstimators:
+    """Per-profile estimators kept across frames so ROI gauges reuse their buffers.
+
+    Use this in capture loops; `estimate_gauges` is the one-shot equivalent.
+    """
+
+    def __init__(self, gauges: dict[str, dict]) -> None:
+        self.gauges = gauges
+        self._roi = {
+            name: RoiGaugeEstimator(gauge)
+            for name, gauge in gauges.items()
+            if gauge.get("sampling_mode", "roi") != "line"
+        }
+
+    def roi_estimator(self, name: str) -> RoiGaugeEstimator | None:
+        """The cached estimator of ROI gauge `name`; None for line gauges."""
+
+        return self._roi.get(name)
+
+    def estimate(self, frame_bgr: np.ndarray) -> dict[str, tuple[int, float]]:
+        frame_hsv, origin = convert_hsv_region(frame_bgr, self.gauges)
+        out = {}
+        for name, gauge in self.gauges.items():
+            roi = self._roi.get(name)
+            out[name] = roi.estimate(frame_hsv, origin) if roi else estimate_health_line(frame_hsv, origin, gauge)
+        return out
+
+
+def resolve_hud_anchor_visible(frame_bgr: np.ndarray, profile: dict) -> bool:
+    """Return True when the configured HUD anchor pixel matches expected color.
+
+    Profile shape:
+      "hud_anchor": {
+        "x": 100,
+        "y": 100,
+        "color_bgr": [12, 34, 56],
+        "tolerance": 20
+      }
+
+    If hud_anchor is omitted, this returns True (feature disabled).
+    """
+
+    anchor = profile.get("hud_anchor")
+    if not isinstance(anchor, dict):
+        return True
+
+    try:
+        x = int(anchor["x"])
+        y = int(anchor["y"])
+        expected = np.array(anchor["color_bgr"], dtype=np.int16)
+    except (KeyError, TypeError, ValueError):
+        return True
+
+    if expected.shape != (3,):
+        return True
+
+    if y < 0 or y >= frame_bgr.shape[0] or x < 0 or x >= frame_bgr.shape[1]:
+        return False
+
+    tolerance = max(0, int(anchor.get("tolerance", 20)))
+    sampled = frame_bgr[y, x].astype(np.int16)
+    return bool(np.all(np.abs(sampled - expected) <= tolerance))
@@ -8,39 +8,181 @@ Then in OBS Browser Source (OVERLAY_FACE_OUTPUT), set URL to:
 
 Send health samples to:
     POST http://127.0.0.1:8765/v1/health-sample
+
+Optional binary UDP ingest (see examples/health_sample_wire.py):
+    python examples/local_overlay_server.py --udp-port 8766
+
+Recent states can be reviewed after a glitch via:
+    GET http://127.0.0.1:8765/v1/history?window_ms=60000
 """
 
 from __future__ import annotations
 
+import argparse
 import json
+import secrets
+import socket
 import threading
 import time
 from http import HTTPStatus
+from dataclasses import dataclass, field
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from urllib.parse import urlparse
+from urllib.parse import parse_qs, urlparse
 import sys
 
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 
-from doomguy_overlay_engine import DoomguyFaceEngine
+from doomguy_overlay_engine import DoomguyFaceEngine, FaceState
+from examples.health_history import RECORD_STRUCT, HealthHistory
+from examples.health_sample_wire import SequenceFilter, unpack_sample
+
 HOST = "127.0.0.1"
 PORT = 8765
+MAX_LONG_POLL_MS = 30_000
+# Versions restart at 1 on every start; the boot id keeps ETags from one run
+# from matching snapshots of the next.
+BOOT_ID = secrets.token_hex(4)
 
 engine = DoomguyFaceEngine()
 state_lock = threading.Lock()
-latest = {
-    "frame": "STFST01",
-    "health_percent": 100,
-    "health_bucket": 0,
-    "look": "center",
-    "is_pain": False,
-    "hud_anchor_visible": True,
-    "updated_at_ms": int(time.time() * 1000),
+
+
+def _default_state() -> dict:
+    return {
+        "frame": "STFST01",
+        "health_percent": 100,
+        "health_bucket": 0,
+        "look": "center",
+        "is_pain": False,
+        "hud_anchor_visible": True,
+        "gauges": {},
+        "updated_at_ms": int(time.time() * 1000),
+    }
+
+
+latest = _default_state()
+history = HealthHistory()
+ingest_stats = {
+    "samples": 0,
+    "heartbeats": 0,
+    "last_sample_at_ms": 0,
+}
+# Missing-sample timeout from the spec: past it the face holds its last frame.
+SAMPLE_TIMEOUT_MS = 600
+ANIMATION_TICK_MS = 100
+animation_clock = {
+    "last_sample_step_ms": 0,
+    "last_step_ms": 0,
 }
 
 
+@dataclass(frozen=True)
+class FaceStateSnapshot:
+    """Immutable, pre-encoded `/v1/face-state` response.
+
+    A new snapshot replaces `current_snapshot` on every state change, so readers
+    serve `body` as-is without taking `state_lock` or re-running `json.dumps`.
+    """
+
+    version: int
+    body: bytes = field(repr=False)
+
+    @property
+    def etag(self) -> str:
+        return f'"{BOOT_ID}-{self.version}"'
+
+
+def _encode_snapshot(version: int, state: dict) -> FaceStateSnapshot:
+    return FaceStateSnapshot(version=version, body=json.dumps({**state, "version": version}).encode("utf-8"))
+
+
+current_snapshot = _encode_snapshot(1, latest)
+snapshot_changed = threading.Condition()
+
+
+def publish_snapshot(state: dict) -> FaceStateSnapshot:
+    """Encode `state` as the next snapshot version and wake long-poll readers.
+
+    Callers hold `state_lock`, which keeps versions strictly increasing.
+    """
+
+    global current_snapshot
+    snapshot = _encode_snapshot(current_snapshot.version + 1, state)
+    with snapshot_changed:
+        current_snapshot = snapshot
+        snapshot_changed.notify_all()
+    return snapshot
+
+
+def wait_for_snapshot(since: int, wait_ms: int) -> FaceStateSnapshot:
+    """Return the first snapshot other than version `since`, or the current one after `wait_ms`.
+
+    Any other version is returned immediately, including an older one after a
+    server restart reset the counter.
+    """
+
+    snapshot = current_snapshot
+    if snapshot.version != since or wait_ms <= 0:
+        return snapshot
+    with snapshot_changed:
+        snapshot_changed.wait_for(lambda: current_snapshot.version != since, timeout=wait_ms / 1000)
+        return current_snapshot
+
+
+def query_history(query: str) -> tuple[str, object]:
+    """Answer a `/v1/history` query string.
+
+    Parameters (all optional):
+    - since_ms / until_ms: absolute range (server clock)
+    - window_ms: shorthand for `since_ms = now - window_ms`
+    - buckets: downsample into N min/max/mean summaries
+    - format: `json` (default) or `binary` (packed `RECORD_STRUCT` records)
+
+    Returns `("json", dict)` or `("binary", (frame_names, packed_records))`.
+    """
+
+    params = parse_qs(query)
+
+    def int_param(name: str) -> int | None:
+        try:
+            return int(params[name][0])
+        except (KeyError, ValueError):
+            return None
+
+    since_ms = int_param("since_ms")
+    until_ms = int_param("until_ms")
+    window_ms = int_param("window_ms")
+    if since_ms is None and window_ms is not None:
+        since_ms = int(time.time() * 1000) - max(0, window_ms)
+    buckets = int_param("buckets")
+    fmt = params.get("format", ["json"])[0]
+
+    with state_lock:
+        frame_names = list(history.frame_names)
+        if fmt == "binary":
+            return "binary", (frame_names, history.to_bytes(since_ms, until_ms))
+        if buckets:
+            return "json", {"summary": history.summary(min(buckets, 10_000), since_ms, until_ms)}
+        return "json", {"capacity": history.capacity, "records": history.records(since_ms, until_ms)}
+
+
+def parse_face_state_query(query: str) -> tuple[int | None, int]:
+    """Parse `?since=<version>&wait=<ms>`; invalid values disable long-poll."""
+
+    params = parse_qs(query)
+    try:
+        since = int(params["since"][0])
+    except (KeyError, ValueError):
+        return None, 0
+    try:
+        wait_ms = max(0, min(MAX_LONG_POLL_MS, int(params.get("wait", ["0"])[0])))
+    except ValueError:
+        wait_ms = 0
+    return since, wait_ms
+
+
 def extract_health_percent(payload: dict) -> int:
     """Extract health from multiple payload shapes for compatibility.
 
@@ -111,6 +253,175 @@ def extract_hud_anchor_visible(payload: dict) -> bool:
     return True
 
 
+def is_heartbeat(payload: dict) -> bool:
+    """True for relay heartbeats (`{"heartbeat": true}`), which mean "state unchanged"."""
+
+    return payload.get("heartbeat") is True
+
+
+def extract_confidence(payload: dict) -> float:
+    """Extract relay confidence clamped to 0.0-1.0; defaults to 1.0 when missing or invalid."""
+
+    return clamp_confidence(payload.get("confidence"))
+
+
+def clamp_confidence(value: object) -> float:
+    """Clamp a confidence value to 0.0-1.0; None, bools, NaN and non-numbers become 1.0."""
+
+    if value is None or isinstance(value, bool):
+        return 1.0
+    try:
+        confidence = float(value)
+    except (TypeError, ValueError):
+        return 1.0
+    if confidence != confidence:  # NaN
+        return 1.0
+    return max(0.0, min(1.0, confidence))
+
+
+def extract_gauges(payload: dict) -> dict[str, int]:
+    """Extract named gauge values from a multi-gauge relay payload.
+
+    Supported shapes per gauge:
+    - gauges.<name>.value (preferred)
+    - gauges.<name> as a bare number
+
+    Values are clamped to 0-100; invalid entries are skipped.
+    """
+
+    gauges_obj = payload.get("gauges")
+    if not isinstance(gauges_obj, dict):
+        return {}
+
+    out: dict[str, int] = {}
+    for name, entry in gauges_obj.items():
+        value = entry.get("value") if isinstance(entry, dict) else entry
+        if value is None or isinstance(value, bool):
+            continue
+        try:
+            out[str(name)] = max(0, min(100, int(float(value))))
+        except (TypeError, ValueError):
+            continue
+    return out
+
+
+def _face_fields(st: FaceState) -> dict:
+    return {
+        "frame": st.frame_name,
+        "health_percent": st.health_percent,
+        "health_bucket": st.health_bucket,
+        "look": st.look,
+        "is_pain": st.is_pain,
+    }
+
+
+def apply_sample(
+    health_percent: int,
+    hud_anchor_visible: bool,
+    gauges: dict[str, int] | None = None,
+    confidence: float = 1.0,
+) -> dict:
+    """Run one sample through the engine, publish it as the latest state and record it in history.
+
+    The engine step, timestamp and snapshot all happen under `state_lock`, so
+    concurrent HTTP and UDP writers publish snapshots in engine-step order.
+    """
+
+    with state_lock:
+        st = engine.update(health_percent)
+        out = {
+            **_face_fields(st),
+            "hud_anchor_visible": hud_anchor_visible,
+            "gauges": gauges or {},
+            "updated_at_ms": int(time.time() * 1000),
+        }
+        latest.update(out)
+        publish_snapshot(latest)
+        animation_clock["last_sample_step_ms"] = animation_clock["last_step_ms"] = out["updated_at_ms"]
+        history.append(
+            out["updated_at_ms"],
+            st.health_percent,
+            st.health_bucket,
+            st.frame_name,
+            st.is_pain,
+            hud_anchor_visible,
+            confidence,
+        )
+        ingest_stats["samples"] += 1
+        ingest_stats["last_sample_at_ms"] = out["updated_at_ms"]
+    return out
+
+
+def apply_heartbeat() -> dict:
+    """Record relay liveness without re-running the engine; returns the held state.
+
+    Animation between samples is driven by `animation_tick`, so the overlay
+    moves at the same pace whatever the relay's heartbeat interval.
+    """
+
+    with state_lock:
+        ingest_stats["heartbeats"] += 1
+        ingest_stats["last_sample_at_ms"] = int(time.time() * 1000)
+        return dict(latest)
+
+
+def animation_tick(now_ms: int | None = None, tick_ms: int = ANIMATION_TICK_MS) -> bool:
+    """Advance look and pain by one engine tick when samples have stopped but the relay is alive.
+
+    Runs only while the last sample or heartbeat is within `SAMPLE_TIMEOUT_MS`,
+    no full sample has stepped the engine for two ticks (delta publishing), and
+    the previous step is at least `tick_ms` old. Returns True when it ticked.
+    """
+
+    with state_lock:
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        if not ingest_stats["last_sample_at_ms"] or now_ms - ingest_stats["last_sample_at_ms"] > SAMPLE_TIMEOUT_MS:
+            return False
+        if now_ms - animation_clock["last_sample_step_ms"] < 2 * tick_ms:
+            return False
+        if now_ms - animation_clock["last_step_ms"] < tick_ms:
+            return False
+        st = engine.tick()
+        latest.update(_face_fields(st), updated_at_ms=now_ms)
+        publish_snapshot(latest)
+        animation_clock["last_step_ms"] = now_ms
+        return True
+
+
+def run_animation_clock(tick_ms: int = ANIMATION_TICK_MS, stop: threading.Event | None = None) -> None:
+    """Call `animation_tick` several times per tick until `stop` is set."""
+
+    stop = stop or threading.Event()
+    while not stop.wait(max(1, tick_ms // 4) / 1000):
+        animation_tick(tick_ms=tick_ms)
+
+
+def serve_udp(sock: socket.socket) -> None:
+    """Ingest binary samples from a bound UDP socket until it is closed.
+
+    Malformed datagrams and samples older than the last accepted sequence on
+    their channel are dropped.
+    """
+
+    sequences = SequenceFilter()
+    while True:
+        try:
+            data, _addr = sock.recvfrom(64)
+        except OSError:
+            return
+        try:
+            sample = unpack_sample(data)
+        except ValueError:
+            continue
+        if not sequences.accept(sample.channel, sample.sequence):
+            continue
+        if sample.is_heartbeat:
+            apply_heartbeat()
+        else:
+            confidence = clamp_confidence(sample.confidence)
+            apply_sample(sample.health_percent, sample.hud_anchor_visible, confidence=confidence)
+
+
 OVERLAY_HTML = """<!doctype html>
 <html>
   <head>
@@ -136,17 +447,27 @@ OVERLAY_HTML = """<!doctype html>
     <script>
       const img = document.getElementById('face');
       let last = 'STFST01';
-      async function tick() {
-        const r = await fetch('/v1/face-state', { cache: 'no-store' });
-        const s = await r.json();
-        img.style.display = s.hud_anchor_visible === false ? 'none' : 'block';
-        if (s.frame && s.frame !== last) {
-          last = s.frame;
-          img.src = '/' + s.frame + '.png';
+      let version = 0;
+      async function poll() {
+        try {
+          const r = await fetch('/v1/face-state?since=' + version + '&wait=10000', { cache: 'no-store' });
+          if (r.status === 200) {
+            const s = await r.json();
+            version = s.version;
+            img.style.display = s.hud_anchor_visible === false ? 'none' : 'block';
+            if (s.frame && s.frame !== last) {
+              last = s.frame;
+              img.src = '/' + s.frame + '.png';
+            }
+          } else if (r.status !== 304) {
+            await new Promise((resolve) => setTimeout(resolve, 500));
+          }
+        } catch (e) {
+          await new Promise((resolve) => setTimeout(resolve, 500));
         }
+        poll();
       }
-      setInterval(tick, 100);
-      tick();
+      poll();
     </script>
   </body>
 </html>
@@ -169,16 +490,62 @@ class Handler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(data)
 
+    def _send_snapshot(self, snapshot: FaceStateSnapshot) -> None:
+        if self.headers.get("If-None-Match") == snapshot.etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", snapshot.etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            return
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(snapshot.body)))
+        self.send_header("ETag", snapshot.etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(snapshot.body)
+
     def do_GET(self) -> None:  # noqa: N802
-        path = urlparse(self.path).path
+        url = urlparse(self.path)
+        path = url.path
 
         if path in {"/", "/overlay"}:
             self._send_bytes(HTTPStatus.OK, OVERLAY_HTML.encode("utf-8"), "text/html; charset=utf-8")
             return
 
         if path == "/v1/face-state":
+            since, wait_ms = parse_face_state_query(url.query)
+            if since is None:
+                self._send_snapshot(current_snapshot)
+                return
+            snapshot = wait_for_snapshot(since, wait_ms)
+            if snapshot.version == since:
+                # Long-poll timed out: the caller already has this version.
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_header("ETag", snapshot.etag)
+                self.end_headers()
+                return
+            self._send_snapshot(snapshot)
+            return
+
+        if path == "/v1/history":
+            kind, result = query_history(url.query)
+            if kind == "binary":
+                frame_names, data = result
+                self.send_response(HTTPStatus.OK)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("X-Record-Format", RECORD_STRUCT.format)
+                self.send_header("X-Frame-Names", ",".join(frame_names))
+                self.end_headers()
+                self.wfile.write(data)
+                return
+            self._send_json(HTTPStatus.OK, result)
+            return
+
+        if path == "/v1/ingest-stats":
             with state_lock:
-                payload = dict(latest)
+                payload = dict(ingest_stats)
             self._send_json(HTTPStatus.OK, payload)
             return
 
@@ -202,30 +569,52 @@ class Handler(BaseHTTPRequestHandler):
         raw = self.rfile.read(content_length)
         payload = json.loads(raw.decode("utf-8") if raw else "{}")
 
-        health_percent = extract_health_percent(payload)
-        hud_anchor_visible = extract_hud_anchor_visible(payload)
-        st = engine.update(health_percent)
-        out = {
-            "frame": st.frame_name,
-            "health_percent": st.health_percent,
-            "health_bucket": st.health_bucket,
-            "look": st.look,
-            "is_pain": st.is_pain,
-            "hud_anchor_visible": hud_anchor_visible,
-            "updated_at_ms": int(time.time() * 1000),
-        }
-
-        with state_lock:
-            latest.update(out)
+        if is_heartbeat(payload):
+            self._send_json(HTTPStatus.OK, {"ok": True, "state": apply_heartbeat()})
+            return
 
+        out = apply_sample(
+            extract_health_percent(payload),
+            extract_hud_anchor_visible(payload),
+            extract_gauges(payload),
+            extract_confidence(payload),
+        )
         self._send_json(HTTPStatus.OK, {"ok": True, "state": out})
 
 
 def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument(
+        "--udp-port", type=int, default=0, help="Also accept binary health samples on this UDP port. 0 = off"
+    )
+    ap.add_argument(
+        "--history-size", type=int, default=6000, help="Samples kept for /v1/history (6000 = 10 min at 10 Hz)"
+    )
+    ap.add_argument(
+        "--tick-ms",
+        type=int,
+        default=ANIMATION_TICK_MS,
+        help="Face animation step while the relay only sends heartbeats; match the relay interval. 0 = off",
+    )
+    args = ap.parse_args()
+
+    global history
+    history = HealthHistory(args.history_size)
+
     server = ThreadingHTTPServer((HOST, PORT), Handler)
     print(f"Local overlay server running at http://{HOST}:{PORT}")
     print(f"Browser source URL: http://{HOST}:{PORT}/overlay")
     print(f"Health sample endpoint: POST http://{HOST}:{PORT}/v1/health-sample")
+
+    if args.udp_port:
+        udp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        udp_sock.bind((HOST, args.udp_port))
+        threading.Thread(target=serve_udp, args=(udp_sock,), daemon=True).start()
+        print(f"Binary health sample endpoint: udp://{HOST}:{args.udp_port}")
+
+    if args.tick_ms > 0:
+        threading.Thread(target=run_animation_clock, args=(args.tick_ms,), daemon=True).start()
+
     server.serve_forever()
 
 
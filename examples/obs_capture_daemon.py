@@ -0,0 +1,139 @@
+"""OBS capture daemon that feeds the shared-memory frame bus.
+
+Owns the only obs-websocket connection, takes one screenshot per tick, decodes
+it once and publishes the BGR frame to `examples/frame_bus.py`. Consumers attach
+with `--frame-bus` instead of talking to OBS themselves:
+
+    python examples/obs_capture_daemon.py --profile game-example-line
+    python examples/obs_to_overlay_relay.py --profile game-example-line --frame-bus doomguy-frames
+    python examples/obs_to_overlay_debug.py --profile game-example-line --frame-bus doomguy-frames
+
+Screenshot failures and obs-websocket drops are logged and retried (with a
+reconnect for connection errors), so the bus segment outlives OBS restarts and
+attached readers keep receiving frames once OBS is back. Only a rejected
+screenshot size, a configuration error, stops the daemon.
+
+Dependencies:
+    pip install obsws-python opencv-python numpy
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import obsws_python as obs
+from obsws_python.error import OBSSDKError, OBSSDKRequestError
+from websocket import WebSocketException
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from examples.frame_bus import DEFAULT_BUS_NAME, FrameBusWriter
+from examples.hud_gauges import decode_obs_data_url, load_profile
+from examples.obs_batch_client import SCREENSHOT_SIZE_HINT, is_screenshot_size_error
+
+DEFAULT_PROFILE_PATH = ROOT / "config" / "game_profiles.example.json"
+RECONNECT_DELAY_SEC = 2.0
+
+# Connection-level failures: the websocket is gone and must be reopened.
+_CONNECTION_ERRORS = (OBSSDKError, WebSocketException, OSError)
+
+
+def connect_obs(host: str, port: int, password: str) -> obs.ReqClient:
+    """Open an obs-websocket connection, retrying until OBS accepts it."""
+
+    while True:
+        try:
+            return obs.ReqClient(host=host, port=port, password=password, timeout=5)
+        except _CONNECTION_ERRORS as exc:
+            print(f"OBS not reachable at {host}:{port} ({exc}); retrying in {RECONNECT_DELAY_SEC:.0f}s")
+            time.sleep(RECONNECT_DELAY_SEC)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--profile", required=True, help="Profile id in config/game_profiles.example.json")
+    ap.add_argument("--profile-path", default=str(DEFAULT_PROFILE_PATH))
+    ap.add_argument("--fps", type=float, default=10.0)
+    ap.add_argument("--bus-name", default=DEFAULT_BUS_NAME, help="Shared memory name consumers attach to")
+    ap.add_argument("--slots", type=int, default=4, help="Ring buffer depth (frames kept for slow readers)")
+    ap.add_argument(
+        "--source-name",
+        default="",
+        help="OBS scene/source to screenshot. Empty uses profile obs_scene_name.",
+    )
+    ap.add_argument("--image-width", type=int, default=0, help="Screenshot width (must be >=8). 0 = auto")
+    ap.add_argument("--image-height", type=int, default=0, help="Screenshot height (must be >=8). 0 = auto")
+    args = ap.parse_args()
+
+    profile = load_profile(Path(args.profile_path), args.profile)
+    scene_name = profile.get("obs_scene_name", "HUD_CAPTURE_SCENE")
+    source_name = args.source_name or scene_name
+
+    obs_host = os.getenv("OBS_HOST", "127.0.0.1")
+    obs_port = int(os.getenv("OBS_PORT", "4455"))
+    obs_password = os.getenv("OBS_PASSWORD", "")
+
+    client = connect_obs(obs_host, obs_port, obs_password)
+
+    if args.image_width >= 8 and args.image_height >= 8:
+        shot_w, shot_h = args.image_width, args.image_height
+    else:
+        video = client.get_video_settings()
+        base_w = getattr(video, "base_width", getattr(video, "baseWidth", 1920))
+        base_h = getattr(video, "base_height", getattr(video, "baseHeight", 1080))
+        shot_w = max(8, int(base_w))
+        shot_h = max(8, int(base_h))
+
+    bus = FrameBusWriter(args.bus_name, max_width=shot_w, max_height=shot_h, slots=args.slots)
+    period = 1.0 / max(1.0, args.fps)
+    print(f"Capture daemon: source={source_name}, screenshot={shot_w}x{shot_h}, bus={bus.name}, slots={bus.slots}")
+
+    last_error = ""
+    try:
+        while True:
+            started = time.monotonic()
+            try:
+                shot = client.get_source_screenshot(source_name, "png", shot_w, shot_h, 100)
+                frame_bgr = decode_obs_data_url(shot.image_data)
+                if frame_bgr is None:
+                    raise ValueError("screenshot could not be decoded")
+                bus.publish(frame_bgr, timestamp_ms=int(time.time() * 1000))
+            except OBSSDKRequestError as exc:
+                if is_screenshot_size_error(exc):
+                    raise RuntimeError(SCREENSHOT_SIZE_HINT) from exc
+                if str(exc) != last_error:
+                    print(f"Screenshot failed ({exc}); retrying every tick")
+                    last_error = str(exc)
+            except ValueError as exc:
+                if str(exc) != last_error:
+                    print(f"Skipping frame: {exc}")
+                    last_error = str(exc)
+            except _CONNECTION_ERRORS as exc:
+                print(f"OBS connection lost ({exc}); reconnecting, frame bus {bus.name} stays up")
+                last_error = ""
+                try:
+                    client.disconnect()
+                except Exception:
+                    pass
+                client = connect_obs(obs_host, obs_port, obs_password)
+                continue
+            else:
+                if last_error:
+                    print("Capture resumed")
+                    last_error = ""
+            time.sleep(max(0.0, period - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        bus.close()
+        bus.unlink()
+        print(f"Frame bus {args.bus_name} removed")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,22 @@
 """OBS screenshot debugger for bar coordinate calibration.
 
-Captures frames from OBS for 30 seconds, overlays bar start/end markers from a
-profile, and writes `debug_last_frame.png` repeatedly (final frame persists).
+Captures frames from OBS for 30 seconds, overlays bar start/end markers (or ROI
+boxes) for every gauge in a profile, and writes `debug_last_frame.png` repeatedly (final frame persists).
+
+With `--preview-port`, it instead serves a live MJPEG preview (cropped to the
+profile's gauges, scaled down, with live health/confidence and per-strip fill
+classification) and only writes the PNG when you click "Save PNG":
 
 Run:
     python examples/obs_to_overlay_debug.py --profile game-example-line
+    python examples/obs_to_overlay_debug.py --profile game-example-line --preview-port 8770
 """
 
 from __future__ import annotations
 
 import argparse
-import base64
-import json
 import os
+import sys
 import time
 from pathlib import Path
 
@@ -21,24 +25,66 @@ import numpy as np
 import obsws_python as obs
 
 ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from examples.calibration_preview import PreviewServer, annotate_frame, preview_region, render_preview
+from examples.frame_bus import FrameBusReader
+from examples.hud_gauges import GaugeEstimators, decode_obs_data_url, load_profile, resolve_gauges
+
 DEFAULT_PROFILE_PATH = ROOT / "config" / "game_profiles.example.json"
 
 
-def decode_obs_data_url(data_url: str) -> np.ndarray:
-    b64 = data_url.split(",", 1)[1]
-    raw = base64.b64decode(b64)
-    arr = np.frombuffer(raw, dtype=np.uint8)
-    bgr = cv2.imdecode(arr, cv2.IMREAD_COLOR)
-    return bgr
+def write_debug_png(frame_bgr: np.ndarray, gauges: dict[str, dict], profile: dict, out_path: Path) -> None:
+    """Legacy mode: annotate the full frame and overwrite `out_path`."""
 
+    dbg = frame_bgr.copy()
 
-def load_profile(path: Path, profile_id: str) -> dict:
-    obj = json.loads(path.read_text())
-    for p in obj.get("profiles", []):
-        if p.get("id") == profile_id:
-            return p
-    ids = [p.get("id") for p in obj.get("profiles", [])]
-    raise ValueError(f"Profile '{profile_id}' not found. Available: {ids}")
+    for name, gauge in gauges.items():
+        if "bar_start" in gauge and "bar_end" in gauge:
+            sx, sy = int(gauge["bar_start"]["x"]), int(gauge["bar_start"]["y"])
+            ex, ey = int(gauge["bar_end"]["x"]), int(gauge["bar_end"]["y"])
+            cv2.circle(dbg, (sx, sy), 7, (0, 255, 0), -1)
+            cv2.circle(dbg, (ex, ey), 7, (0, 0, 255), -1)
+            cv2.line(dbg, (sx, sy), (ex, ey), (255, 0, 255), 2)
+            label_at = (sx, max(15, sy - 12))
+        elif "health_roi" in gauge:
+            roi = gauge["health_roi"]
+            x, y, w, h = int(roi["x"]), int(roi["y"]), int(roi["width"]), int(roi["height"])
+            cv2.rectangle(dbg, (x, y), (x + w, y + h), (255, 0, 255), 2)
+            label_at = (x, max(15, y - 6))
+        else:
+            continue
+        cv2.putText(dbg, name, label_at, cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 255), 1, cv2.LINE_AA)
+
+    anchor = profile.get("hud_anchor")
+    if isinstance(anchor, dict):
+        ax, ay = int(anchor.get("x", -1)), int(anchor.get("y", -1))
+        if 0 <= ay < frame_bgr.shape[0] and 0 <= ax < frame_bgr.shape[1]:
+            sampled = frame_bgr[ay, ax].tolist()
+            cv2.circle(dbg, (ax, ay), 6, (0, 255, 255), -1)
+            cv2.putText(
+                dbg,
+                f"HUD anchor BGR={sampled}",
+                (max(5, ax + 10), max(20, ay - 10)),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.5,
+                (0, 255, 255),
+                1,
+                cv2.LINE_AA,
+            )
+            print(f"hud_anchor sample at ({ax},{ay}): BGR={sampled}")
+
+    cv2.imwrite(str(out_path), dbg)
+
+
+def copy_latest_bus_frame(reader: FrameBusReader) -> np.ndarray | None:
+    """Private copy of the newest frame-bus frame, or None if its slot was recycled mid-copy."""
+
+    frame = reader.read_latest()
+    if frame is None:
+        return None
+    image = frame.image.copy()
+    return image if reader.is_valid(frame) else None
 
 
 def main() -> None:
@@ -54,78 +100,108 @@ def main() -> None:
     )
     ap.add_argument("--image-width", type=int, default=0, help="Screenshot width (must be >=8). 0 = auto")
     ap.add_argument("--image-height", type=int, default=0, help="Screenshot height (must be >=8). 0 = auto")
+    ap.add_argument(
+        "--frame-bus",
+        default="",
+        help="Read frames from a running obs_capture_daemon.py bus instead of connecting to OBS.",
+    )
+    ap.add_argument(
+        "--preview-port",
+        type=int,
+        default=0,
+        help="Serve a live MJPEG calibration preview on this port (runs until Ctrl+C). 0 = write PNGs",
+    )
+    ap.add_argument("--preview-width", type=int, default=640, help="Max preview width in pixels")
+    ap.add_argument("--preview-margin", type=int, default=40, help="Pixels kept around gauges in the preview crop")
     args = ap.parse_args()
 
     profile = load_profile(Path(args.profile_path), args.profile)
+    gauges = resolve_gauges(profile)
     scene_name = profile.get("obs_scene_name", "HUD_CAPTURE_SCENE")
     source_name = args.source_name or scene_name
 
-    obs_host = os.getenv("OBS_HOST", "127.0.0.1")
-    obs_port = int(os.getenv("OBS_PORT", "4455"))
-    obs_password = os.getenv("OBS_PASSWORD", "")
-
-    client = obs.ReqClient(host=obs_host, port=obs_port, password=obs_password, timeout=5)
-
-    if args.image_width >= 8 and args.image_height >= 8:
-        shot_w, shot_h = args.image_width, args.image_height
+    reader = None
+    client = None
+    if args.frame_bus:
+        reader = FrameBusReader(args.frame_bus)
+        print(f"Debug capture: frame_bus={reader.name}, duration={args.duration_sec}s")
     else:
-        video = client.get_video_settings()
-        base_w = getattr(video, "base_width", getattr(video, "baseWidth", 1920))
-        base_h = getattr(video, "base_height", getattr(video, "baseHeight", 1080))
-        shot_w = max(8, int(base_w))
-        shot_h = max(8, int(base_h))
+        obs_host = os.getenv("OBS_HOST", "127.0.0.1")
+        obs_port = int(os.getenv("OBS_PORT", "4455"))
+        obs_password = os.getenv("OBS_PASSWORD", "")
+
+        client = obs.ReqClient(host=obs_host, port=obs_port, password=obs_password, timeout=5)
+
+        if args.image_width >= 8 and args.image_height >= 8:
+            shot_w, shot_h = args.image_width, args.image_height
+        else:
+            video = client.get_video_settings()
+            base_w = getattr(video, "base_width", getattr(video, "baseWidth", 1920))
+            base_h = getattr(video, "base_height", getattr(video, "baseHeight", 1080))
+            shot_w = max(8, int(base_w))
+            shot_h = max(8, int(base_h))
+        print(f"Debug capture: source={source_name}, screenshot={shot_w}x{shot_h}, duration={args.duration_sec}s")
 
     period = 1.0 / max(1.0, args.fps)
-    print(f"Debug capture: source={source_name}, screenshot={shot_w}x{shot_h}, duration={args.duration_sec}s")
 
     printed_shape = False
     deadline = time.time() + max(1.0, args.duration_sec)
     out_path = ROOT / "debug_last_frame.png"
-
-    while time.time() < deadline:
-        shot = client.get_source_screenshot(source_name, "png", shot_w, shot_h, 100)
-        frame_bgr = decode_obs_data_url(shot.image_data)
-
-        if not printed_shape:
-            print("frame size:", frame_bgr.shape[1], "x", frame_bgr.shape[0])
-            printed_shape = True
-
-        dbg = frame_bgr.copy()
-
-        if "bar_start" in profile and "bar_end" in profile:
-            sx, sy = int(profile["bar_start"]["x"]), int(profile["bar_start"]["y"])
-            ex, ey = int(profile["bar_end"]["x"]), int(profile["bar_end"]["y"])
-            cv2.circle(dbg, (sx, sy), 7, (0, 255, 0), -1)
-            cv2.circle(dbg, (ex, ey), 7, (0, 0, 255), -1)
-            cv2.line(dbg, (sx, sy), (ex, ey), (255, 0, 255), 2)
-        elif "health_roi" in profile:
-            roi = profile["health_roi"]
-            x, y, w, h = int(roi["x"]), int(roi["y"]), int(roi["width"]), int(roi["height"])
-            cv2.rectangle(dbg, (x, y), (x + w, y + h), (255, 0, 255), 2)
-
-        anchor = profile.get("hud_anchor")
-        if isinstance(anchor, dict):
-            ax, ay = int(anchor.get("x", -1)), int(anchor.get("y", -1))
-            if 0 <= ay < frame_bgr.shape[0] and 0 <= ax < frame_bgr.shape[1]:
-                sampled = frame_bgr[ay, ax].tolist()
-                cv2.circle(dbg, (ax, ay), 6, (0, 255, 255), -1)
-                cv2.putText(
-                    dbg,
-                    f"HUD anchor BGR={sampled}",
-                    (max(5, ax + 10), max(20, ay - 10)),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.5,
-                    (0, 255, 255),
-                    1,
-                    cv2.LINE_AA,
+    last_seq = 0
+
+    preview = None
+    region = None
+    # Live-loop only; `/save` annotates on the HTTP thread with its own estimators.
+    estimators = GaugeEstimators(gauges)
+    if args.preview_port:
+        preview = PreviewServer(
+            "127.0.0.1", args.preview_port, out_path, lambda frame: annotate_frame(frame, gauges, profile)
+        )
+        preview.start()
+        deadline = float("inf")
+        print(f"Live calibration preview: {preview.url} (Ctrl+C to stop)")
+
+    try:
+        while time.time() < deadline:
+            if reader is not None:
+                frame = reader.wait_next(last_seq, timeout=1.0)
+                if frame is None:
+                    continue
+                last_seq = frame.seq
+                frame_bgr = frame.image
+            else:
+                shot = client.get_source_screenshot(source_name, "png", shot_w, shot_h, 100)
+                frame_bgr = decode_obs_data_url(shot.image_data)
+
+            if not printed_shape:
+                print("frame size:", frame_bgr.shape[1], "x", frame_bgr.shape[0])
+                printed_shape = True
+
+            if preview is not None:
+                if region is None:
+                    region = preview_region(frame_bgr.shape, gauges, profile, margin=args.preview_margin)
+                annotated = annotate_frame(frame_bgr, gauges, profile, region, estimators)
+                # Skip frame-bus frames whose slot was refilled while they were being read.
+                if reader is not None and not reader.is_valid(frame):
+                    continue
+                # Bus views are recycled by the writer, so saves copy the latest frame on demand.
+                preview.push(
+                    render_preview(annotated, args.preview_width),
+                    frame_bgr if reader is None else lambda: copy_latest_bus_frame(reader),
                 )
-                print(f"hud_anchor sample at ({ax},{ay}): BGR={sampled}")
-
-        cv2.imwrite(str(out_path), dbg)
-
-        time.sleep(period)
-
-    print(f"Wrote debug overlay: {out_path}")
+                time.sleep(period)
+                continue
+
+            write_debug_png(frame_bgr, gauges, profile, out_path)
+            time.sleep(period)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if preview is not None:
+            preview.close()
+
+    if preview is None:
+        print(f"Wrote debug overlay: {out_path}")
 
 
 if __name__ == "__main__":
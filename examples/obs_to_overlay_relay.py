@@ -5,11 +5,20 @@ health_percent from either:
 - rectangular ROI sampling, or
 - line-based sampling (recommended for diagonal bars)
 
+Profiles may declare several named `gauges` (for example health + armor); all of
+them are estimated from the same screenshot, decode and HSV conversion. A gauge
+may set `obs_source_name` to read from another OBS source; screenshots of all
+sources are then fetched in one obs-websocket request batch per tick.
+
 Then it posts health samples to a local overlay server:
     POST http://127.0.0.1:8765/v1/health-sample
 
+or, with `--transport udp`, sends compact binary samples (see
+examples/health_sample_wire.py) to the server's `--udp-port` listener.
+
 Dependencies:
     pip install obsws-python opencv-python numpy requests
+    (the relay talks to OBS through websocket-client, installed with obsws-python)
 
 OBS prerequisites:
 1) Enable obs-websocket in OBS (Tools -> WebSocket Server Settings)
@@ -23,173 +32,145 @@ Run:
 from __future__ import annotations
 
 import argparse
-import base64
-import json
 import os
+import socket
+import sys
 import time
+from collections.abc import Callable
 from pathlib import Path
 
-import cv2
 import numpy as np
-import obsws_python as obs
 import requests
 
 ROOT = Path(__file__).resolve().parent.parent
-DEFAULT_PROFILE_PATH = ROOT / "config" / "game_profiles.example.json"
-
-
-def clamp_health(value: float) -> int:
-    return int(max(0, min(100, round(value))))
-
-
-def decode_obs_data_url(data_url: str) -> np.ndarray:
-    # Format: data:image/png;base64,AAAA...
-    b64 = data_url.split(",", 1)[1]
-    raw = base64.b64decode(b64)
-    arr = np.frombuffer(raw, dtype=np.uint8)
-    bgr = cv2.imdecode(arr, cv2.IMREAD_COLOR)
-    return bgr
-
-
-def hsv_mask_ratio(hsv_img: np.ndarray, low: list[int], high: list[int]) -> float:
-    low_np = np.array(low, dtype=np.uint8)
-    high_np = np.array(high, dtype=np.uint8)
-    mask = cv2.inRange(hsv_img, low_np, high_np)
-    return float(mask.mean() / 255.0)
+sys.path.insert(0, str(ROOT))
+
+from examples.frame_bus import FrameBusReader
+from examples.health_sample_wire import FLAG_HEARTBEAT, initial_sequence, pack_sample
+from examples.obs_batch_client import (
+    SCREENSHOT_SIZE_HINT,
+    ObsBatchClient,
+    ObsRequestError,
+    is_screenshot_size_error,
+)
+from examples.publish_policy import DeltaPublishPolicy
+from examples.hud_gauges import (
+    GaugeEstimators,
+    decode_obs_data_url,
+    load_profile,
+    primary_gauge_name,
+    resolve_gauges,
+    resolve_hud_anchor_visible,
+)
 
+DEFAULT_PROFILE_PATH = ROOT / "config" / "game_profiles.example.json"
 
-def estimate_health_roi(frame_bgr: np.ndarray, profile: dict) -> tuple[int, float]:
-    roi = profile["health_roi"]
-    x, y, w, h = roi["x"], roi["y"], roi["width"], roi["height"]
-    crop = frame_bgr[y : y + h, x : x + w]
-    hsv = cv2.cvtColor(crop, cv2.COLOR_BGR2HSV)
-
-    low = profile["fill_color_hsv"]["low"]
-    high = profile["fill_color_hsv"]["high"]
-    low_np = np.array(low, dtype=np.uint8)
-    high_np = np.array(high, dtype=np.uint8)
-    mask = cv2.inRange(hsv, low_np, high_np)
 
-    # Project mask along bar direction.
-    direction = profile.get("direction", "left_to_right")
-    col_fill = (mask > 0).mean(axis=0)
-    thresh = 0.25
-    filled_cols = np.where(col_fill > thresh)[0]
+def group_gauges_by_source(gauges: dict[str, dict], default_source: str) -> dict[str, dict[str, dict]]:
+    """Group gauges by the OBS source they read from (`obs_source_name`, else the default)."""
 
-    if len(filled_cols) == 0:
-        return 0, 0.6
+    groups: dict[str, dict[str, dict]] = {default_source: {}}
+    for name, gauge in gauges.items():
+        groups.setdefault(gauge.get("obs_source_name") or default_source, {})[name] = gauge
+    return groups
 
-    if direction == "right_to_left":
-        rightmost = int(filled_cols.max())
-        health = 100.0 * ((w - 1 - rightmost) / max(1, w - 1))
-    else:
-        rightmost = int(filled_cols.max())
-        health = 100.0 * (rightmost / max(1, w - 1))
-
-    confidence = float(max(0.0, min(1.0, mask.mean() / 255.0 * 1.5)))
-    return clamp_health(health), confidence
-
-
-def sample_strip_hsv(frame_hsv: np.ndarray, center: np.ndarray, normal: np.ndarray, half_t: int) -> np.ndarray:
-    pts = []
-    for k in range(-half_t, half_t + 1):
-        p = center + normal * k
-        x = int(round(p[0]))
-        y = int(round(p[1]))
-        if 0 <= x < frame_hsv.shape[1] and 0 <= y < frame_hsv.shape[0]:
-            pts.append(frame_hsv[y, x])
-    if not pts:
-        return np.array([0, 0, 0], dtype=np.float32)
-    return np.mean(np.array(pts, dtype=np.float32), axis=0)
-
-
-def estimate_health_line(frame_bgr: np.ndarray, profile: dict) -> tuple[int, float]:
-    s = np.array([profile["bar_start"]["x"], profile["bar_start"]["y"]], dtype=np.float32)
-    e = np.array([profile["bar_end"]["x"], profile["bar_end"]["y"]], dtype=np.float32)
-    n_samples = int(profile.get("line_samples", 200))
-    thickness = int(profile.get("bar_thickness", 5))
-
-    v = e - s
-    length = float(np.linalg.norm(v))
-    if length < 1.0:
-        return 0, 0.0
-    u = v / length
-    n = np.array([-u[1], u[0]], dtype=np.float32)
-
-    frame_hsv = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2HSV)
-    low = np.array(profile["fill_color_hsv"]["low"], dtype=np.float32)
-    high = np.array(profile["fill_color_hsv"]["high"], dtype=np.float32)
-
-    filled = []
-    half_t = max(1, thickness // 2)
-
-    for i in range(n_samples):
-        t = i / max(1, (n_samples - 1))
-        p = s + u * (t * length)
-        hsv_avg = sample_strip_hsv(frame_hsv, p, n, half_t)
-        is_filled = np.all(hsv_avg >= low) and np.all(hsv_avg <= high)
-        filled.append(bool(is_filled))
-
-    filled_indices = [i for i, val in enumerate(filled) if val]
-    if not filled_indices:
-        return 0, 0.55
-
-    direction = profile.get("direction", "left_to_right")
-    if direction == "right_to_left":
-        first = min(filled_indices)
-        health = 100.0 * ((n_samples - 1 - first) / max(1, n_samples - 1))
-    else:
-        last = max(filled_indices)
-        health = 100.0 * (last / max(1, n_samples - 1))
 
-    confidence = float(sum(filled) / max(1, n_samples))
-    return clamp_health(health), confidence
+class HttpSampleSender:
+    """POSTs the full JSON payload to the overlay server."""
 
+    def __init__(self, overlay_url: str) -> None:
+        self._url = overlay_url
+        self._session = requests.Session()
 
+    def send(self, payload: dict) -> None:
+        self._session.post(self._url, json=payload, timeout=1.0)
 
+    def send_heartbeat(self, payload: dict) -> None:
+        heartbeat = {"game_id": payload["game_id"], "timestamp_ms": payload["timestamp_ms"], "heartbeat": True}
+        self._session.post(self._url, json=heartbeat, timeout=1.0)
 
-def resolve_hud_anchor_visible(frame_bgr: np.ndarray, profile: dict) -> bool:
-    """Return True when the configured HUD anchor pixel matches expected color.
 
-    Profile shape:
-      "hud_anchor": {
-        "x": 100,
-        "y": 100,
-        "color_bgr": [12, 34, 56],
-        "tolerance": 20
-      }
+class UdpSampleSender:
+    """Sends the primary gauge as one fixed-size binary datagram.
 
-    If hud_anchor is omitted, this returns True (feature disabled).
+    Secondary gauges and source metadata are not part of the binary format.
     """
 
-    anchor = profile.get("hud_anchor")
-    if not isinstance(anchor, dict):
-        return True
-
-    try:
-        x = int(anchor["x"])
-        y = int(anchor["y"])
-        expected = np.array(anchor["color_bgr"], dtype=np.int16)
-    except (KeyError, TypeError, ValueError):
-        return True
+    def __init__(self, target: str, channel: int = 0) -> None:
+        host, _, port = target.rpartition(":")
+        self._addr = (host or "127.0.0.1", int(port))
+        self._channel = channel
+        self._sequence = initial_sequence()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def send(self, payload: dict, flags: int = 0) -> None:
+        self._sequence += 1
+        packet = pack_sample(
+            channel=self._channel,
+            sequence=self._sequence,
+            timestamp_ms=payload["timestamp_ms"],
+            health_percent=payload["health_percent"],
+            confidence=payload["confidence"],
+            hud_anchor_visible=payload["hud_anchor_visible"],
+            flags=flags,
+        )
+        self._sock.sendto(packet, self._addr)
+
+    def send_heartbeat(self, payload: dict) -> None:
+        self.send(payload, flags=FLAG_HEARTBEAT)
+
+
+def publish_sample(
+    sender: HttpSampleSender | UdpSampleSender,
+    profile: dict,
+    estimators_by_source: dict[str, GaugeEstimators],
+    primary: str,
+    scene_name: str,
+    frames: dict[str, np.ndarray],
+    anchor_source: str,
+    policy: DeltaPublishPolicy | None = None,
+    frame_valid: Callable[[], bool] | None = None,
+) -> bool:
+    """Estimate all gauges (one pass per source frame) and send the sample to the overlay server.
+
+    With a `policy`, unchanged samples are suppressed or sent as heartbeats.
+    `frame_valid` is checked after estimation; when it returns False (for
+    example a frame-bus slot recycled mid-read) the sample is dropped and
+    False is returned.
+    """
 
-    if expected.shape != (3,):
-        return True
+    per_source = {src: est.estimate(frames[src]) for src, est in estimators_by_source.items() if est.gauges}
+    estimates = {name: est for group in per_source.values() for name, est in group.items()}
+    health, confidence = estimates[primary]
 
-    if y < 0 or y >= frame_bgr.shape[0] or x < 0 or x >= frame_bgr.shape[1]:
+    hud_anchor_visible = resolve_hud_anchor_visible(frames[anchor_source], profile)
+    if frame_valid is not None and not frame_valid():
+        print("frame recycled during estimation; sample dropped")
         return False
-
-    tolerance = max(0, int(anchor.get("tolerance", 20)))
-    sampled = frame_bgr[y, x].astype(np.int16)
-    return bool(np.all(np.abs(sampled - expected) <= tolerance))
-
-def load_profile(path: Path, profile_id: str) -> dict:
-    obj = json.loads(path.read_text())
-    for p in obj.get("profiles", []):
-        if p.get("id") == profile_id:
-            return p
-    ids = [p.get("id") for p in obj.get("profiles", [])]
-    raise ValueError(f"Profile '{profile_id}' not found. Available: {ids}")
+    payload = {
+        "game_id": profile["id"],
+        "timestamp_ms": int(time.time() * 1000),
+        "health_percent": health,
+        "confidence": round(confidence, 3),
+        "hud_anchor_visible": hud_anchor_visible,
+        "gauges": {
+            name: {"value": value, "confidence": round(conf, 3)} for name, (value, conf) in estimates.items()
+        },
+        "source": {"scene": scene_name},
+    }
+
+    action = "sample" if policy is None else policy.decide(payload, payload["timestamp_ms"])
+    if action == "sample":
+        sender.send(payload)
+    elif action == "heartbeat":
+        sender.send_heartbeat(payload)
+
+    gauge_text = " ".join(f"{name}={value:3d}" for name, (value, _) in estimates.items())
+    line = f"{gauge_text} confidence={confidence:.2f} hud_anchor_visible={hud_anchor_visible}"
+    if policy is not None:
+        line += f" [{action}] " + " ".join(f"{k}={v}" for k, v in policy.counters().items())
+    print(line)
+    return True
 
 
 def main() -> None:
@@ -208,73 +189,116 @@ def main() -> None:
     )
     ap.add_argument("--image-width", type=int, default=0, help="Screenshot width (must be >=8). 0 = auto")
     ap.add_argument("--image-height", type=int, default=0, help="Screenshot height (must be >=8). 0 = auto")
+    ap.add_argument(
+        "--frame-bus",
+        default="",
+        help="Read frames from a running obs_capture_daemon.py bus instead of connecting to OBS.",
+    )
+    ap.add_argument(
+        "--transport",
+        choices=("http", "udp"),
+        default="http",
+        help="http = JSON POST to --overlay-url; udp = binary samples to --udp-target (primary gauge only)",
+    )
+    ap.add_argument("--udp-target", default="127.0.0.1:8766", help="host:port of the server's --udp-port")
+    ap.add_argument("--channel", type=int, default=0, help="Channel id carried in binary UDP samples")
+    ap.add_argument(
+        "--delta-publish",
+        action="store_true",
+        help="Send samples only when the estimated state changes, plus heartbeats every --heartbeat-ms",
+    )
+    ap.add_argument(
+        "--heartbeat-ms", type=int, default=250, help="Heartbeat interval for --delta-publish (keep below 600)"
+    )
     args = ap.parse_args()
 
     profile = load_profile(Path(args.profile_path), args.profile)
+    gauges = resolve_gauges(profile)
+    primary = primary_gauge_name(gauges)
     scene_name = profile.get("obs_scene_name", "HUD_CAPTURE_SCENE")
     source_name = args.source_name or scene_name
+    gauges_by_source = group_gauges_by_source(gauges, source_name)
+    # Kept for the whole run so ROI gauges reuse their mask/column buffers every frame.
+    estimators_by_source = {src: GaugeEstimators(group) for src, group in gauges_by_source.items()}
+
+    period = 1.0 / max(1.0, args.fps)
+    if args.transport == "udp":
+        sender = UdpSampleSender(args.udp_target, channel=args.channel)
+    else:
+        sender = HttpSampleSender(args.overlay_url)
+    policy = DeltaPublishPolicy(heartbeat_ms=args.heartbeat_ms) if args.delta_publish else None
+
+    if args.frame_bus:
+        if len(gauges_by_source) > 1:
+            raise SystemExit(
+                "--frame-bus carries a single source; remove per-gauge obs_source_name or drop --frame-bus"
+            )
+        reader = FrameBusReader(args.frame_bus)
+        print(
+            f"Relay started: profile={args.profile}, gauges={list(gauges)}, "
+            f"frame_bus={reader.name} ({reader.max_width}x{reader.max_height})"
+        )
+        last_seq = 0
+        while True:
+            frame = reader.wait_next(last_seq, timeout=2.0)
+            if frame is None:
+                print("waiting for frames from capture daemon...")
+                continue
+            last_seq = frame.seq
+            # Estimates read the shared slot in place, so confirm the daemon did not recycle it meanwhile.
+            frames = {source_name: frame.image}
+            publish_sample(
+                sender,
+                profile,
+                estimators_by_source,
+                primary,
+                scene_name,
+                frames,
+                source_name,
+                policy,
+                frame_valid=lambda: reader.is_valid(frame),
+            )
+            time.sleep(period)
 
     obs_host = os.getenv("OBS_HOST", "127.0.0.1")
     obs_port = int(os.getenv("OBS_PORT", "4455"))
     obs_password = os.getenv("OBS_PASSWORD", "")
 
-    client = obs.ReqClient(host=obs_host, port=obs_port, password=obs_password, timeout=5)
+    client = ObsBatchClient(host=obs_host, port=obs_port, password=obs_password, timeout=5)
 
-    scene_name = profile.get("obs_scene_name", "HUD_CAPTURE_SCENE")
     # OBS websocket requires imageWidth/imageHeight >= 8 for GetSourceScreenshot.
     if args.image_width >= 8 and args.image_height >= 8:
         shot_w, shot_h = args.image_width, args.image_height
     else:
         video = client.get_video_settings()
-        base_w = getattr(video, "base_width", getattr(video, "baseWidth", 1920))
-        base_h = getattr(video, "base_height", getattr(video, "baseHeight", 1080))
+        base_w = video.get("baseWidth", 1920)
+        base_h = video.get("baseHeight", 1080)
         shot_w = max(8, int(base_w))
         shot_h = max(8, int(base_h))
-        if source_name != scene_name:
+        if any(src != scene_name for src in gauges_by_source):
             print(
-                "WARNING: auto screenshot size uses OBS base canvas. If --source-name is a "
-                "sub-source (for example GAME_FEED), coordinates are in resized screenshot "
+                "WARNING: auto screenshot size uses OBS base canvas. If --source-name (or a gauge "
+                "obs_source_name) is a sub-source (for example GAME_FEED), coordinates are in resized screenshot "
                 "space and may feel off. Prefer --source-name "
                 f"{scene_name} or pass explicit --image-width/--image-height."
             )
 
-    period = 1.0 / max(1.0, args.fps)
     print(
-        f"Relay started: profile={args.profile}, sampling_mode={profile.get('sampling_mode', 'roi')}, "
-        f"source={source_name}, screenshot={shot_w}x{shot_h}"
+        f"Relay started: profile={args.profile}, gauges={list(gauges)}, "
+        f"sources={list(gauges_by_source)}, screenshot={shot_w}x{shot_h}"
     )
 
+    source_names = list(gauges_by_source)
     while True:
         try:
-            shot = client.get_source_screenshot(source_name, "png", shot_w, shot_h, 100)
-        except Exception as exc:
-            msg = str(exc)
-            if "imageWidth" in msg or "minimum of `8" in msg:
-                raise RuntimeError(
-                    "OBS rejected screenshot size. Use --image-width/--image-height >= 8, "
-                    "or omit them to auto-use OBS base resolution."
-                ) from exc
+            shots = client.get_source_screenshots(source_names, shot_w, shot_h)
+        except ObsRequestError as exc:
+            if is_screenshot_size_error(exc):
+                raise RuntimeError(SCREENSHOT_SIZE_HINT) from exc
             raise
 
-        frame_bgr = decode_obs_data_url(shot.image_data)
-
-        mode = profile.get("sampling_mode", "roi")
-        if mode == "line":
-            health, confidence = estimate_health_line(frame_bgr, profile)
-        else:
-            health, confidence = estimate_health_roi(frame_bgr, profile)
-
-        hud_anchor_visible = resolve_hud_anchor_visible(frame_bgr, profile)
-        payload = {
-            "game_id": profile["id"],
-            "timestamp_ms": int(time.time() * 1000),
-            "health_percent": health,
-            "hud_anchor_visible": hud_anchor_visible,
-            "source": {"scene": scene_name},
-        }
-
-        requests.post(args.overlay_url, json=payload, timeout=1.0)
-        print(f"health={health:3d} confidence={confidence:.2f} hud_anchor_visible={hud_anchor_visible}")
+        frames = {src: decode_obs_data_url(data_url) for src, data_url in shots.items()}
+        publish_sample(sender, profile, estimators_by_source, primary, scene_name, frames, source_name, policy)
         time.sleep(period)
 
 
@@ -0,0 +1,69 @@
+"""Delta-only publish policy for the relay.
+
+The relay estimates a sample every tick, but most ticks repeat the previous
+state. `DeltaPublishPolicy` sends a full sample only when the estimated state
+changes and otherwise a lightweight heartbeat once per `heartbeat_ms`, so the
+server's 600 ms missing-sample timeout stays satisfied without a network call
+on every tick. The server's animation clock keeps the look cycle and pain
+pulses moving while only heartbeats arrive.
+"""
+
+from __future__ import annotations
+
+from typing import Literal
+
+PublishAction = Literal["sample", "heartbeat", "suppress"]
+
+
+class DeltaPublishPolicy:
+    """Decide per tick whether to send a sample, a heartbeat or nothing.
+
+    State is `health_percent`, `hud_anchor_visible`, every gauge value and
+    `confidence`; confidence only counts as changed when it moves by at least
+    `confidence_epsilon`, so estimator jitter does not defeat suppression.
+    """
+
+    def __init__(self, heartbeat_ms: int = 250, confidence_epsilon: float = 0.05) -> None:
+        self.heartbeat_ms = max(1, int(heartbeat_ms))
+        self.confidence_epsilon = confidence_epsilon
+        self.samples_sent = 0
+        self.heartbeats_sent = 0
+        self.suppressed = 0
+        self._last_state: tuple | None = None
+        self._last_confidence = 0.0
+        self._last_sent_ms = 0
+
+    @staticmethod
+    def _state_key(payload: dict) -> tuple:
+        gauges = payload.get("gauges") or {}
+        return (
+            payload.get("health_percent"),
+            payload.get("hud_anchor_visible"),
+            tuple(sorted((name, g.get("value")) for name, g in gauges.items())),
+        )
+
+    def decide(self, payload: dict, now_ms: int) -> PublishAction:
+        state = self._state_key(payload)
+        confidence = float(payload.get("confidence", 1.0))
+        changed = (
+            state != self._last_state
+            or abs(confidence - self._last_confidence) >= self.confidence_epsilon
+        )
+
+        if changed:
+            self._last_state = state
+            self._last_confidence = confidence
+            self._last_sent_ms = now_ms
+            self.samples_sent += 1
+            return "sample"
+
+        if now_ms - self._last_sent_ms >= self.heartbeat_ms:
+            self._last_sent_ms = now_ms
+            self.heartbeats_sent += 1
+            return "heartbeat"
+
+        self.suppressed += 1
+        return "suppress"
+
+    def counters(self) -> dict[str, int]:
+        return {"sent": self.samples_sent, "heartbeats": self.heartbeats_sent, "suppressed": self.suppressed}
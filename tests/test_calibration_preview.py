@@ -0,0 +1,110 @@
+import urllib.request
+
+import pytest
+
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+
+from examples.calibration_preview import PreviewServer, annotate_frame, preview_region, render_preview
+from examples.hud_gauges import GaugeEstimators
+
+RED_HSV = {"low": [0, 120, 70], "high": [10, 255, 255]}
+GAUGES = {"health": {"health_roi": {"x": 100, "y": 100, "width": 50, "height": 10}, "fill_color_hsv": RED_HSV}}
+PROFILE = {"hud_anchor": {"x": 90, "y": 95, "color_bgr": [0, 0, 0], "tolerance": 5}}
+
+
+def _frame() -> "np.ndarray":
+    frame = np.zeros((400, 600, 3), dtype=np.uint8)
+    frame[100:110, 100:125] = (0, 0, 255)
+    return frame
+
+
+def test_preview_region_covers_gauges_and_anchor_with_margin():
+    assert preview_region((400, 600, 3), GAUGES, PROFILE, margin=10) == (80, 85, 160, 120)
+    assert preview_region((400, 600, 3), GAUGES, PROFILE, margin=500) == (0, 0, 600, 400)
+
+
+def test_annotate_frame_only_copies_region_and_marks_column_fill():
+    frame = _frame()
+    region = preview_region(frame.shape, GAUGES, PROFILE, margin=10)
+    annotated = annotate_frame(frame, GAUGES, PROFILE, region)
+
+    assert annotated.shape == (35, 80, 3)
+    strip_y = 100 + 10 + 2 - region[1]
+    assert tuple(annotated[strip_y, 100 - region[0] + 5]) == (0, 255, 0)  # filled column
+    assert tuple(annotated[strip_y, 100 - region[0] + 40]) == (0, 0, 255)  # empty column
+    assert not frame[:, :, 1].any()  # source frame untouched
+
+
+def test_annotate_frame_reuses_estimator_buffers_and_matches_one_shot():
+    gauges = {
+        **GAUGES,
+        "armor": {
+            "sampling_mode": "line",
+            "bar_start": {"x": 100, "y": 130},
+            "bar_end": {"x": 149, "y": 130},
+            "line_samples": 25,
+            "fill_color_hsv": RED_HSV,
+        },
+    }
+    frame = _frame()
+    frame[128:133, 100:120] = (0, 0, 255)
+    estimators = GaugeEstimators(gauges)
+
+    first = annotate_frame(frame, gauges, PROFILE, estimators=estimators)
+    mask = estimators.roi_estimator("health")._mask
+    second = annotate_frame(frame, gauges, PROFILE, estimators=estimators)
+
+    assert estimators.roi_estimator("health")._mask is mask
+    assert np.array_equal(first, second)
+    assert np.array_equal(first, annotate_frame(frame, gauges, PROFILE))
+
+
+def test_render_preview_scales_down_to_max_width():
+    jpeg = render_preview(np.zeros((100, 400, 3), dtype=np.uint8), max_width=200)
+    decoded = cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+    assert decoded.shape[:2] == (50, 200)
+
+
+def test_preview_server_streams_mjpeg_and_saves_only_on_request(tmp_path):
+    out_path = tmp_path / "debug_last_frame.png"
+    server = PreviewServer("127.0.0.1", 0, out_path, lambda frame: annotate_frame(frame, GAUGES, PROFILE))
+    server.start()
+    try:
+        frame = _frame()
+        server.push(render_preview(annotate_frame(frame, GAUGES, PROFILE), 320), frame)
+
+        stream = urllib.request.urlopen(server.url + "preview.mjpg", timeout=5)
+        assert stream.headers["Content-Type"].startswith("multipart/x-mixed-replace")
+        assert stream.readline() == b"--frame\r\n"
+        stream.close()
+        assert not out_path.exists()
+
+        req = urllib.request.Request(server.url + "save", method="POST")
+        assert urllib.request.urlopen(req, timeout=5).status == 200
+        assert cv2.imread(str(out_path)).shape == frame.shape
+    finally:
+        server.close()
+
+
+def test_preview_server_loads_lazy_frames_only_when_saving(tmp_path):
+    out_path = tmp_path / "debug_last_frame.png"
+    server = PreviewServer("127.0.0.1", 0, out_path, lambda frame: frame)
+    server.start()
+    loads = []
+
+    def load_frame():
+        loads.append(1)
+        return None if len(loads) == 1 else _frame()  # first save: the frame has expired
+
+    try:
+        server.push(b"jpeg", load_frame)
+        server.push(b"jpeg", load_frame)
+        assert loads == []
+
+        assert server.save() is None
+        assert not out_path.exists()
+        assert server.save() == out_path
+        assert cv2.imread(str(out_path)).shape == _frame().shape
+    finally:
+        server.close()
@@ -72,3 +72,16 @@ def test_dead_frame_at_zero_health():
     st = eng.update(0)
     assert st.frame_name == "STFDEAD0"
     assert st.is_pain is False
+
+
+def test_tick_advances_look_and_expires_pain_at_last_health():
+    eng = DoomguyFaceEngine()
+
+    eng.update(100)
+    assert eng.update(50).frame_name == "STFOUCH2"
+    ticks = [eng.tick() for _ in range(3)]
+
+    assert [t.is_pain for t in ticks] == [True, True, False]
+    assert [t.look for t in ticks] == ["center", "right", "center"]
+    assert ticks[-1].frame_name == "STFST21"
+    assert all(t.health_percent == 50 for t in ticks)
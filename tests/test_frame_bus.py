@@ -0,0 +1,58 @@
+import uuid
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from examples.frame_bus import FrameBusReader, FrameBusWriter
+
+
+@pytest.fixture()
+def bus():
+    writer = FrameBusWriter(f"dgtest-{uuid.uuid4().hex[:8]}", max_width=16, max_height=8, slots=2)
+    yield writer
+    writer.close()
+    writer.unlink()
+
+
+def test_reader_sees_nothing_before_first_publish(bus):
+    reader = FrameBusReader(bus.name)
+    assert reader.read_latest() is None
+    assert reader.wait_next(0, timeout=0.01) is None
+    reader.close()
+
+
+def test_reader_gets_zero_copy_view_of_latest_frame(bus):
+    reader = FrameBusReader(bus.name)
+    frame = np.full((4, 10, 3), 7, dtype=np.uint8)
+    seq = bus.publish(frame, timestamp_ms=1234)
+
+    got = reader.read_latest()
+    assert (got.seq, got.timestamp_ms, got.image.shape) == (seq, 1234, (4, 10, 3))
+    assert np.array_equal(got.image, frame)
+    assert got.image.flags.writeable is False
+    assert not got.image.flags.owndata
+    del got
+    reader.close()
+
+
+def test_recycled_slot_invalidates_old_frame(bus):
+    reader = FrameBusReader(bus.name)
+    bus.publish(np.zeros((8, 16, 3), dtype=np.uint8))
+    first = reader.wait_next(0, timeout=0.1)
+    assert reader.is_valid(first)
+
+    bus.publish(np.ones((8, 16, 3), dtype=np.uint8))
+    assert reader.is_valid(first)  # two slots: still intact
+    bus.publish(np.full((8, 16, 3), 2, dtype=np.uint8))
+    assert not reader.is_valid(first)
+
+    latest = reader.wait_next(first.seq, timeout=0.1)
+    assert latest.seq == 3 and int(latest.image[0, 0, 0]) == 2
+    del first, latest
+    reader.close()
+
+
+def test_publish_rejects_frames_larger_than_bus(bus):
+    with pytest.raises(ValueError):
+        bus.publish(np.zeros((9, 16, 3), dtype=np.uint8))
@@ -0,0 +1,67 @@
+from examples.health_history import RECORD_STRUCT, HealthHistory
+
+
+def _fill(history: HealthHistory, samples: list[tuple[int, int]]) -> None:
+    for ts, health in samples:
+        history.append(ts, health, 0, f"STFST0{health % 3}", health < 20, True, 0.9)
+
+
+def test_ring_keeps_only_latest_capacity_records_in_order():
+    history = HealthHistory(capacity=3)
+    _fill(history, [(10, 100), (20, 90), (30, 80), (40, 70)])
+
+    assert len(history) == 3
+    assert [r["timestamp_ms"] for r in history.records()] == [20, 30, 40]
+    assert [r["health_percent"] for r in history.records()] == [90, 80, 70]
+
+
+def test_records_filter_by_time_range():
+    history = HealthHistory(capacity=4)
+    _fill(history, [(10, 100), (20, 90), (30, 80), (40, 70), (50, 60)])
+
+    assert [r["timestamp_ms"] for r in history.records(since_ms=25)] == [30, 40, 50]
+    assert [r["timestamp_ms"] for r in history.records(20, 40)] == [20, 30, 40]
+    assert history.records(since_ms=60) == []
+
+
+def test_binary_export_uses_fixed_records_and_frame_table():
+    history = HealthHistory(capacity=8)
+    history.append(1000, 15, 4, "STFOUCH4", True, False, 0.5)
+    history.append(1100, 15, 4, "STFST41", False, True, 1.0)
+
+    data = history.to_bytes()
+    assert len(data) == 2 * RECORD_STRUCT.size
+    ts, health, bucket, frame_id, pain, visible, conf = RECORD_STRUCT.unpack_from(data, 0)
+    assert (ts, health, bucket, pain, visible, conf) == (1000, 15, 4, 1, 0, 0.5)
+    assert history.frame_names[frame_id] == "STFOUCH4"
+    assert history.frame_names[RECORD_STRUCT.unpack_from(data, RECORD_STRUCT.size)[3]] == "STFST41"
+
+
+def test_summary_downsamples_min_max_mean_per_bucket():
+    history = HealthHistory(capacity=16)
+    _fill(history, [(0, 100), (10, 80), (20, 60), (30, 40), (40, 10), (99, 30)])
+
+    summary = history.summary(2, since_ms=0, until_ms=99)
+    assert [(b["start_ms"], b["end_ms"], b["count"]) for b in summary] == [(0, 49, 5), (50, 99, 1)]
+    assert (summary[0]["health_min"], summary[0]["health_max"], summary[0]["health_mean"]) == (10, 100, 58.0)
+    assert summary[0]["pain_samples"] == 1
+    assert summary[1]["health_mean"] == 30.0
+
+
+def test_summary_never_inverts_bucket_bounds_for_short_spans():
+    history = HealthHistory(capacity=16)
+    _fill(history, [(456, 70)])
+    assert [(b["start_ms"], b["end_ms"], b["count"]) for b in history.summary(3)] == [(456, 456, 1)]
+
+    _fill(history, [(1000, 60), (1999, 50)])
+    summary = history.summary(2000, since_ms=1000, until_ms=1999)
+    assert all(b["end_ms"] >= b["start_ms"] for b in summary)
+    assert [b["count"] for b in summary] == [1, 1]
+
+
+def test_backwards_clock_step_keeps_timestamps_sorted():
+    history = HealthHistory(capacity=8)
+    _fill(history, [(100, 90), (200, 80), (150, 70), (300, 60)])
+
+    assert [r["timestamp_ms"] for r in history.records()] == [100, 200, 200, 300]
+    assert [r["health_percent"] for r in history.records(since_ms=200, until_ms=250)] == [80, 70]
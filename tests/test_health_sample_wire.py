@@ -0,0 +1,65 @@
+import pytest
+
+from examples.health_sample_wire import SAMPLE_STRUCT, SequenceFilter, pack_sample, unpack_sample
+
+
+def test_pack_unpack_round_trip():
+    raw = pack_sample(channel=3, sequence=42, timestamp_ms=1737000000000, health_percent=73, confidence=0.5)
+    assert len(raw) == SAMPLE_STRUCT.size == 23
+
+    sample = unpack_sample(raw)
+    assert (sample.channel, sample.sequence, sample.timestamp_ms) == (3, 42, 1737000000000)
+    assert (sample.health_percent, sample.confidence, sample.hud_anchor_visible) == (73, 0.5, True)
+
+
+def test_pack_clamps_health_and_wraps_sequence():
+    sample = unpack_sample(pack_sample(0, 2**32 + 5, 0, 250, 1.0, hud_anchor_visible=False))
+    assert sample.health_percent == 100
+    assert sample.sequence == 5
+    assert sample.hud_anchor_visible is False
+
+
+def test_unpack_rejects_foreign_packets():
+    with pytest.raises(ValueError):
+        unpack_sample(b"{}")
+    with pytest.raises(ValueError):
+        unpack_sample(b"XX" + pack_sample(0, 1, 0, 50, 1.0)[2:])
+
+
+def test_sequence_filter_drops_duplicates_and_out_of_order_per_channel():
+    seq = SequenceFilter()
+    assert seq.accept(0, 10) is True
+    assert seq.accept(0, 10) is False
+    assert seq.accept(0, 9) is False
+    assert seq.accept(1, 9) is True
+    assert seq.accept(0, 11) is True
+
+
+def test_sequence_filter_handles_wrap_and_sender_restart():
+    seq = SequenceFilter(restart_window=100)
+    assert seq.accept(0, 2**32 - 1) is True
+    assert seq.accept(0, 0) is True
+    assert seq.accept(0, 50_000) is True
+    assert seq.accept(0, 1) is True  # far behind: relay restarted
+
+
+def test_restart_after_short_run_is_accepted():
+    from examples.health_sample_wire import initial_sequence
+
+    seq = SequenceFilter()
+    t0 = 1_737_000_000_000
+    first_run = initial_sequence(t0)
+    for i in range(1, 601):  # one minute at 10 Hz
+        assert seq.accept(0, first_run + i) is True
+
+    second_run = initial_sequence(t0 + 60_000)
+    assert seq.accept(0, second_run + 1) is True
+    assert seq.accept(0, second_run + 2) is True
+    assert seq.accept(0, second_run + 1) is False
+
+
+def test_initial_sequence_wraps_to_u32():
+    from examples.health_sample_wire import initial_sequence
+
+    assert 0 <= initial_sequence() < 2**32
+    assert initial_sequence(2**32 + 7) == 7
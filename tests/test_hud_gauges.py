@@ -0,0 +1,181 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+
+from examples.hud_gauges import (
+    GaugeEstimators,
+    RoiGaugeEstimator,
+    convert_hsv_region,
+    estimate_gauges,
+    primary_gauge_name,
+    resolve_gauges,
+)
+
+RED_HSV = {"low": [0, 120, 70], "high": [10, 255, 255]}
+GREEN_HSV = {"low": [45, 80, 80], "high": [90, 255, 255]}
+
+
+def _frame_with_bars() -> "np.ndarray":
+    frame = np.zeros((120, 200, 3), dtype=np.uint8)
+    frame[10:20, 10:60] = (0, 0, 255)  # red health bar, half of a 100px ROI
+    frame[50:54, 20:170] = (0, 255, 0)  # green armor line, full length
+    return frame
+
+
+def test_resolve_gauges_wraps_legacy_profile_as_health():
+    profile = {"id": "legacy", "health_roi": {"x": 1, "y": 2, "width": 3, "height": 4}, "fill_color_hsv": RED_HSV}
+    gauges = resolve_gauges(profile)
+    assert list(gauges) == ["health"]
+    assert gauges["health"]["health_roi"]["width"] == 3
+    assert "id" not in gauges["health"]
+
+
+def test_primary_gauge_prefers_health_then_first_declared():
+    assert primary_gauge_name({"armor": {}, "health": {}}) == "health"
+    assert primary_gauge_name({"shield": {}, "armor": {}}) == "shield"
+
+
+def test_convert_hsv_region_covers_union_of_gauges():
+    gauges = {
+        "a": {"health_roi": {"x": 10, "y": 10, "width": 100, "height": 10}},
+        "b": {"health_roi": {"x": 150, "y": 90, "width": 100, "height": 10}},
+    }
+    hsv, origin = convert_hsv_region(_frame_with_bars(), gauges)
+    assert origin == (10, 10)
+    assert hsv.shape == (90, 190, 3)  # clipped to the 200x120 frame
+
+
+def test_estimate_gauges_reads_every_gauge_from_one_frame():
+    profile = {
+        "gauges": {
+            "health": {
+                "health_roi": {"x": 10, "y": 10, "width": 101, "height": 10},
+                "fill_color_hsv": RED_HSV,
+            },
+            "armor": {
+                "sampling_mode": "line",
+                "bar_start": {"x": 20, "y": 52},
+                "bar_end": {"x": 169, "y": 52},
+                "bar_thickness": 3,
+                "line_samples": 50,
+                "fill_color_hsv": GREEN_HSV,
+            },
+        }
+    }
+    estimates = estimate_gauges(_frame_with_bars(), resolve_gauges(profile))
+    assert estimates["health"][0] == 49
+    assert estimates["armor"] == (100, 1.0)
+
+
+def _reference_roi(hsv: "np.ndarray", gauge: dict) -> tuple[int, float]:
+    """Pre-vectorization ROI algorithm, kept as the equivalence oracle."""
+    w = gauge["health_roi"]["width"]
+    mask = cv2.inRange(hsv, np.array(RED_HSV["low"], np.uint8), np.array(RED_HSV["high"], np.uint8))
+    filled_cols = np.where((mask > 0).mean(axis=0) > 0.25)[0]
+    if len(filled_cols) == 0:
+        return 0, 0.6
+    health = 100.0 * (int(filled_cols.max()) / max(1, w - 1))
+    return int(max(0, min(100, round(health)))), float(max(0.0, min(1.0, mask.mean() / 255.0 * 1.5)))
+
+
+def _bar(width: int, height: int, columns: dict[int, int], top: int = 0) -> "np.ndarray":
+    """BGR ROI-sized frame; `columns` maps column -> number of red rows starting at row `top`."""
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    for col, rows in columns.items():
+        frame[top : top + rows, col] = (0, 0, 255)
+    return frame
+
+
+def test_roi_estimator_matches_reference_and_reuses_buffers():
+    gauge = {"health_roi": {"x": 0, "y": 0, "width": 40, "height": 6}, "fill_color_hsv": RED_HSV}
+    estimator = RoiGaugeEstimator(gauge)
+    rng = np.random.default_rng(7)
+    buffers = None
+    for _ in range(20):
+        frame = _bar(40, 6, {c: int(rng.integers(0, 7)) for c in range(40)})
+        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+        health, confidence = estimator.estimate(hsv, (0, 0))
+        ref_health, ref_conf = _reference_roi(hsv, gauge)
+        assert health == ref_health
+        assert confidence == pytest.approx(ref_conf)
+        if buffers is None:
+            buffers = (estimator._mask, estimator._col_sum)
+        assert estimator._mask is buffers[0] and estimator._col_sum is buffers[1]
+
+
+def test_subpixel_edge_uses_partial_column_coverage():
+    base = {"health_roi": {"x": 0, "y": 0, "width": 11, "height": 10}, "fill_color_hsv": RED_HSV}
+    sub = {**base, "subpixel_edge": True}
+
+    # Columns 0-4 full, column 5 at 20% (below the 25% column threshold).
+    hsv = cv2.cvtColor(_bar(11, 10, {**{c: 10 for c in range(5)}, 5: 2}), cv2.COLOR_BGR2HSV)
+    assert RoiGaugeEstimator(base).estimate(hsv, (0, 0))[0] == 40
+    assert RoiGaugeEstimator(sub).estimate(hsv, (0, 0))[0] == 42
+
+    # Edge column only 60% covered: the edge sits inside it.
+    hsv = cv2.cvtColor(_bar(11, 10, {**{c: 10 for c in range(4)}, 4: 6}), cv2.COLOR_BGR2HSV)
+    assert RoiGaugeEstimator(base).estimate(hsv, (0, 0))[0] == 40
+    assert RoiGaugeEstimator(sub).estimate(hsv, (0, 0))[0] == 36
+
+    # Crisp edges and a full bar are unchanged.
+    hsv = cv2.cvtColor(_bar(11, 10, {c: 10 for c in range(11)}), cv2.COLOR_BGR2HSV)
+    assert RoiGaugeEstimator(sub).estimate(hsv, (0, 0))[0] == 100
+
+
+def test_subpixel_edge_is_relative_to_bar_not_roi_height():
+    # 24-row ROI around a 20-row bar: 2 margin rows above and below.
+    base = {"health_roi": {"x": 0, "y": 0, "width": 20, "height": 24}, "fill_color_hsv": RED_HSV}
+    sub = {**base, "subpixel_edge": True}
+
+    def health(gauge: dict, columns: dict[int, int]) -> int:
+        hsv = cv2.cvtColor(_bar(20, 24, columns, top=2), cv2.COLOR_BGR2HSV)
+        return RoiGaugeEstimator(gauge).estimate(hsv, (0, 0))[0]
+
+    full = {c: 20 for c in range(20)}
+    half = {c: 20 for c in range(10)}
+    assert health(base, full) == health(sub, full) == 100
+    assert health(base, half) == health(sub, half) == 47
+
+    # Column 10 covers 4 of the bar's 20 rows: under the 25% ROI threshold, but 20% of the bar.
+    assert health(base, {**half, 10: 4}) == 47
+    assert health(sub, {**half, 10: 4}) == 48
+
+
+def test_gauge_estimators_match_one_shot_estimates():
+    gauges = resolve_gauges(
+        {
+            "gauges": {
+                "health": {"health_roi": {"x": 10, "y": 10, "width": 101, "height": 10}, "fill_color_hsv": RED_HSV},
+                "armor": {
+                    "sampling_mode": "line",
+                    "bar_start": {"x": 20, "y": 52},
+                    "bar_end": {"x": 169, "y": 52},
+                    "line_samples": 50,
+                    "fill_color_hsv": GREEN_HSV,
+                },
+            }
+        }
+    )
+    estimators = GaugeEstimators(gauges)
+    for _ in range(2):
+        assert estimators.estimate(_frame_with_bars()) == estimate_gauges(_frame_with_bars(), gauges)
+
+
+def test_right_to_left_roi_tracks_and_refines_leftmost_edge():
+    base = {
+        "health_roi": {"x": 0, "y": 0, "width": 11, "height": 10},
+        "fill_color_hsv": RED_HSV,
+        "direction": "right_to_left",
+    }
+    sub = {**base, "subpixel_edge": True}
+
+    # Fill anchored on the right: columns 6-10 full, column 5 at 20%.
+    hsv = cv2.cvtColor(_bar(11, 10, {**{c: 10 for c in range(6, 11)}, 5: 2}), cv2.COLOR_BGR2HSV)
+    assert RoiGaugeEstimator(base).estimate(hsv, (0, 0))[0] == 40
+    assert RoiGaugeEstimator(sub).estimate(hsv, (0, 0))[0] == 42
+
+    # Edge column 60% covered.
+    hsv = cv2.cvtColor(_bar(11, 10, {**{c: 10 for c in range(7, 11)}, 6: 6}), cv2.COLOR_BGR2HSV)
+    assert RoiGaugeEstimator(base).estimate(hsv, (0, 0))[0] == 40
+    assert RoiGaugeEstimator(sub).estimate(hsv, (0, 0))[0] == 36
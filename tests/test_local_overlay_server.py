@@ -1,4 +1,35 @@
-from examples.local_overlay_server import extract_health_percent, extract_hud_anchor_visible
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from doomguy_overlay_engine import DoomguyFaceEngine
+from examples import local_overlay_server as server
+from examples.health_history import HealthHistory
+from examples.health_sample_wire import pack_sample
+from examples.local_overlay_server import (
+    MAX_LONG_POLL_MS,
+    extract_confidence,
+    extract_gauges,
+    extract_health_percent,
+    extract_hud_anchor_visible,
+    parse_face_state_query,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_server_state(monkeypatch):
+    """Give every test its own engine, face state, history, counters and snapshot version."""
+
+    latest = server._default_state()
+    monkeypatch.setattr(server, "engine", DoomguyFaceEngine())
+    monkeypatch.setattr(server, "latest", latest)
+    monkeypatch.setattr(server, "history", HealthHistory())
+    monkeypatch.setattr(server, "ingest_stats", {key: 0 for key in server.ingest_stats})
+    monkeypatch.setattr(server, "animation_clock", {key: 0 for key in server.animation_clock})
+    monkeypatch.setattr(server, "current_snapshot", server._encode_snapshot(1, latest))
 
 
 def test_extract_health_percent_prefers_explicit_health_percent():
@@ -32,3 +63,181 @@ def test_extract_hud_anchor_visible_supports_nested_and_string_values():
 def test_extract_hud_anchor_visible_defaults_true_for_missing_or_invalid():
     assert extract_hud_anchor_visible({}) is True
     assert extract_hud_anchor_visible({"hud_anchor_visible": "maybe"}) is True
+
+
+def test_extract_gauges_reads_values_and_bare_numbers():
+    payload = {"gauges": {"health": {"value": 73, "confidence": 0.9}, "armor": "40"}}
+    assert extract_gauges(payload) == {"health": 73, "armor": 40}
+
+
+def test_extract_gauges_clamps_and_skips_invalid_entries():
+    payload = {"gauges": {"shield": {"value": 150}, "bad": {"value": "x"}, "flag": True}}
+    assert extract_gauges(payload) == {"shield": 100}
+    assert extract_gauges({}) == {}
+    assert extract_gauges({"gauges": [1, 2]}) == {}
+
+
+def test_serve_udp_applies_binary_samples_in_sequence_order():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    worker = threading.Thread(target=server.serve_udp, args=(sock,), daemon=True)
+    worker.start()
+
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    addr = sock.getsockname()
+    samples = server.ingest_stats["samples"]
+    sender.sendto(pack_sample(7, 2, 0, 64, 0.9, hud_anchor_visible=False), addr)
+    sender.sendto(b"not a sample", addr)
+    sender.sendto(pack_sample(7, 3, 0, 55, 0.9, hud_anchor_visible=False), addr)
+    sender.sendto(pack_sample(7, 1, 0, 12, 0.9), addr)  # stale, dropped
+
+    deadline = time.time() + 2.0
+    while server.ingest_stats["samples"] < samples + 2 and time.time() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)  # give the stale datagram time to be (not) applied
+    sock.close()
+    sender.close()
+
+    assert server.ingest_stats["samples"] == samples + 2
+    assert server.latest["health_percent"] == 55
+    assert server.latest["hud_anchor_visible"] is False
+
+
+def test_heartbeat_holds_state_without_running_engine():
+    server.apply_sample(64, True)
+    before = dict(server.latest)
+    heartbeats = server.ingest_stats["heartbeats"]
+
+    assert server.is_heartbeat({"game_id": "local", "heartbeat": True}) is True
+    assert server.is_heartbeat({"health_percent": 50}) is False
+    held = server.apply_heartbeat()
+
+    assert held == before
+    assert server.latest == before
+    assert server.ingest_stats["heartbeats"] == heartbeats + 1
+
+
+def test_animation_clock_clears_pain_between_samples_at_tick_rate():
+    server.apply_sample(100, True)
+    assert server.apply_sample(50, True)["frame"] == "STFOUCH2"
+    t0 = server.latest["updated_at_ms"]
+    assert server.apply_heartbeat()["frame"] == "STFOUCH2"
+
+    assert server.animation_tick(t0 + 150, tick_ms=100) is False  # samples may still be arriving
+    frames = []
+    for now_ms in (t0 + 200, t0 + 250, t0 + 300, t0 + 400):
+        if server.animation_tick(now_ms, tick_ms=100):
+            frames.append(server.latest["frame"])
+
+    assert frames[:2] == ["STFOUCH2", "STFOUCH2"]
+    assert frames[2].startswith("STFST2")
+    assert server.latest["health_percent"] == 50
+
+
+def test_animation_clock_stops_when_relay_is_silent():
+    server.apply_sample(80, True)
+    version = server.current_snapshot.version
+    last_seen = server.ingest_stats["last_sample_at_ms"]
+
+    assert server.animation_tick(last_seen + server.SAMPLE_TIMEOUT_MS + 1, tick_ms=100) is False
+    assert server.current_snapshot.version == version
+
+
+def test_snapshots_are_versioned_and_pre_encoded():
+    before = server.current_snapshot
+    server.apply_sample(42, True)
+    after = server.current_snapshot
+
+    assert after.version == before.version + 1
+    assert after.etag == f'"{server.BOOT_ID}-{after.version}"'
+    body = json.loads(after.body)
+    assert body["health_percent"] == 42 and body["version"] == after.version
+
+    server.apply_heartbeat()
+    assert server.current_snapshot is after
+
+
+def test_parse_face_state_query():
+    assert parse_face_state_query("") == (None, 0)
+    assert parse_face_state_query("since=5") == (5, 0)
+    assert parse_face_state_query("since=5&wait=250") == (5, 250)
+    assert parse_face_state_query("since=5&wait=999999") == (5, MAX_LONG_POLL_MS)
+    assert parse_face_state_query("since=x&wait=250") == (None, 0)
+
+
+def test_long_poll_wakes_on_publish_and_times_out_otherwise():
+    current = server.current_snapshot.version
+    started = time.monotonic()
+    assert server.wait_for_snapshot(current, 50).version == current
+    assert time.monotonic() - started >= 0.04
+
+    assert server.wait_for_snapshot(current - 1, 5000).version == current  # already newer: no wait
+
+    timer = threading.Timer(0.05, server.apply_sample, args=(33, True))
+    timer.start()
+    snapshot = server.wait_for_snapshot(current, 5000)
+    timer.join()
+    assert snapshot.version == current + 1
+
+
+def test_extract_confidence_clamps_and_defaults():
+    assert extract_confidence({"confidence": 0.94}) == 0.94
+    assert extract_confidence({"confidence": "1.7"}) == 1.0
+    assert extract_confidence({"confidence": "bad"}) == 1.0
+    assert extract_confidence({}) == 1.0
+    assert extract_confidence({"confidence": float("nan")}) == 1.0
+
+
+def test_udp_nan_confidence_is_clamped_before_history():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    threading.Thread(target=server.serve_udp, args=(sock,), daemon=True).start()
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    samples = server.ingest_stats["samples"]
+    sender.sendto(pack_sample(9, 1, 0, 47, float("nan")), sock.getsockname())
+    sender.sendto(pack_sample(9, 2, 0, 46, -3.0), sock.getsockname())
+
+    deadline = time.time() + 2.0
+    while server.ingest_stats["samples"] < samples + 2 and time.time() < deadline:
+        time.sleep(0.01)
+    sock.close()
+    sender.close()
+
+    _kind, result = server.query_history("window_ms=60000")
+    confidences = [r["confidence"] for r in result["records"][-2:]]
+    assert confidences == [1.0, 0.0]
+    json.dumps(result, allow_nan=False)
+
+
+def test_applied_samples_are_queryable_from_history():
+    server.apply_sample(21, True, confidence=0.8)
+    kind, result = server.query_history("window_ms=60000")
+    assert kind == "json"
+    last = result["records"][-1]
+    assert (last["health_percent"], last["confidence"]) == (21, 0.8)
+
+    kind, (frame_names, data) = server.query_history("format=binary")
+    assert kind == "binary"
+    assert len(data) % server.RECORD_STRUCT.size == 0 and frame_names
+
+
+def test_concurrent_samples_publish_in_engine_step_order():
+    for _ in range(5):
+        server.apply_sample(100, True)
+    start_version = server.current_snapshot.version
+
+    def worker() -> None:
+        for _ in range(50):
+            server.apply_sample(100, True)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    records = server.history.records()[-400:]
+    frames = [r["frame"] for r in records]
+    assert server.current_snapshot.version == start_version + 400
+    assert all(frames[i] == frames[i + 4] for i in range(len(frames) - 4))  # unbroken look cycle
+    assert all(a["timestamp_ms"] <= b["timestamp_ms"] for a, b in zip(records, records[1:]))
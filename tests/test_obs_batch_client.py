@@ -0,0 +1,161 @@
+import base64
+import hashlib
+import json
+import socket
+import struct
+import threading
+
+import pytest
+
+pytest.importorskip("websocket")
+
+from examples.obs_batch_client import ObsBatchClient, ObsRequestError, auth_response, is_screenshot_size_error
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class StandInObsServer:
+    """Single-connection obs-websocket v5 stand-in built on plain sockets."""
+
+    def __init__(self, password: str = "", sources: tuple[str, ...] = ("GAME_FEED", "HUD_CROP")) -> None:
+        self.password = password
+        self.sources = set(sources)
+        self.received_ops: list[int] = []
+        self._sock = socket.socket()
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(1)
+        self.port = self._sock.getsockname()[1]
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._sock.close()
+
+    def _serve(self) -> None:
+        conn, _ = self._sock.accept()
+        with conn:
+            request = b""
+            while b"\r\n\r\n" not in request:
+                request += conn.recv(4096)
+            key = next(
+                line.split(":", 1)[1].strip()
+                for line in request.decode().split("\r\n")
+                if line.lower().startswith("sec-websocket-key:")
+            )
+            accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+            conn.sendall(
+                (
+                    "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                    f"Sec-WebSocket-Accept: {accept}\r\nSec-WebSocket-Protocol: obswebsocket.json\r\n\r\n"
+                ).encode()
+            )
+
+            hello = {"obsWebSocketVersion": "5.0.0", "rpcVersion": 1}
+            if self.password:
+                hello["authentication"] = {"salt": "c2FsdA==", "challenge": "Y2hhbGxlbmdl"}
+            self._send(conn, {"op": 0, "d": hello})
+
+            while True:
+                msg = self._recv(conn)
+                if msg is None:
+                    return
+                self.received_ops.append(msg["op"])
+                self._handle(conn, msg["op"], msg["d"])
+
+    def _handle(self, conn: socket.socket, op: int, d: dict) -> None:
+        if op == 1:
+            if self.password and d.get("authentication") != auth_response(
+                self.password, "c2FsdA==", "Y2hhbGxlbmdl"
+            ):
+                conn.close()
+                return
+            self._send(conn, {"op": 2, "d": {"negotiatedRpcVersion": 1}})
+        elif op == 6:
+            self._send(conn, {"op": 7, "d": self._result(d)})
+        elif op == 8:
+            results = [self._result(r) for r in d["requests"]]
+            self._send(conn, {"op": 9, "d": {"requestId": d["requestId"], "results": results}})
+
+    def _result(self, req: dict) -> dict:
+        data = req.get("requestData", {})
+        out = {"requestType": req["requestType"], "requestId": req.get("requestId")}
+        if req["requestType"] == "GetVideoSettings":
+            return {**out, "requestStatus": {"result": True, "code": 100}, "responseData": {"baseWidth": 1280}}
+        if req["requestType"] == "GetSourceScreenshot" and data.get("sourceName") in self.sources:
+            image = f"data:image/png;base64,{data['sourceName']}@{data['imageWidth']}"
+            return {**out, "requestStatus": {"result": True, "code": 100}, "responseData": {"imageData": image}}
+        return {**out, "requestStatus": {"result": False, "code": 600, "comment": "No source was found."}}
+
+    @staticmethod
+    def _send(conn: socket.socket, obj: dict) -> None:
+        raw = json.dumps(obj).encode()
+        if len(raw) < 126:
+            header = struct.pack("!BB", 0x81, len(raw))
+        else:
+            header = struct.pack("!BBH", 0x81, 126, len(raw))
+        conn.sendall(header + raw)
+
+    @staticmethod
+    def _recv(conn: socket.socket) -> dict | None:
+        def read(n: int) -> bytes:
+            buf = b""
+            while len(buf) < n:
+                chunk = conn.recv(n - len(buf))
+                if not chunk:
+                    raise ConnectionError
+                buf += chunk
+            return buf
+
+        try:
+            b0, b1 = read(2)
+            length = b1 & 0x7F
+            if length == 126:
+                (length,) = struct.unpack("!H", read(2))
+            elif length == 127:
+                (length,) = struct.unpack("!Q", read(8))
+            mask = read(4)
+            payload = bytes(b ^ mask[i % 4] for i, b in enumerate(read(length)))
+        except (ConnectionError, OSError):
+            return None
+        if b0 & 0x0F == 0x8:
+            return None
+        return json.loads(payload)
+
+
+@pytest.fixture()
+def server():
+    srv = StandInObsServer(password="hunter2")
+    yield srv
+    srv.close()
+
+
+def test_single_request_after_authenticated_identify(server):
+    client = ObsBatchClient(port=server.port, password="hunter2", timeout=2)
+    assert client.get_video_settings() == {"baseWidth": 1280}
+    client.close()
+
+
+def test_all_source_screenshots_arrive_in_one_batch(server):
+    client = ObsBatchClient(port=server.port, password="hunter2", timeout=2)
+    shots = client.get_source_screenshots(["GAME_FEED", "HUD_CROP"], 640, 360)
+    client.close()
+
+    assert shots == {
+        "GAME_FEED": "data:image/png;base64,GAME_FEED@640",
+        "HUD_CROP": "data:image/png;base64,HUD_CROP@640",
+    }
+    assert server.received_ops == [1, 8]
+
+
+def test_failed_batch_entry_raises_request_error(server):
+    client = ObsBatchClient(port=server.port, password="hunter2", timeout=2)
+    with pytest.raises(ObsRequestError) as info:
+        client.get_source_screenshots(["GAME_FEED", "MISSING"], 640, 360)
+    client.close()
+    assert info.value.code == 600
+
+
+def test_is_screenshot_size_error_matches_obs_size_rejections():
+    assert is_screenshot_size_error(ObsRequestError("GetSourceScreenshot", 402, "imageWidth is below minimum"))
+    assert is_screenshot_size_error(RuntimeError("Field value must be a minimum of `8`"))
+    assert not is_screenshot_size_error(ObsRequestError("GetSourceScreenshot", 600, "No source was found"))
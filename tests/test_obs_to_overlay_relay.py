@@ -0,0 +1,67 @@
+import uuid
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+pytest.importorskip("requests")
+pytest.importorskip("websocket")
+
+from examples.frame_bus import FrameBusReader, FrameBusWriter
+from examples.hud_gauges import GaugeEstimators, resolve_gauges
+from examples.obs_to_overlay_relay import publish_sample
+
+PROFILE = {
+    "id": "test",
+    "health_roi": {"x": 0, "y": 0, "width": 10, "height": 4},
+    "fill_color_hsv": {"low": [0, 120, 70], "high": [10, 255, 255]},
+}
+
+
+class RecordingSender:
+    def __init__(self) -> None:
+        self.sent: list[dict] = []
+
+    def send(self, payload: dict) -> None:
+        self.sent.append(payload)
+
+    def send_heartbeat(self, payload: dict) -> None:
+        self.sent.append({"heartbeat": True})
+
+
+def test_publish_sample_drops_estimates_from_a_recycled_bus_slot():
+    writer = FrameBusWriter(f"dgtest-{uuid.uuid4().hex[:8]}", max_width=16, max_height=8, slots=2)
+    reader = FrameBusReader(writer.name)
+    try:
+        image = np.zeros((8, 16, 3), dtype=np.uint8)
+        image[:4, :5] = (0, 0, 255)
+        writer.publish(image)
+        frame = reader.read_latest()
+
+        sender = RecordingSender()
+        estimators = {"scene": GaugeEstimators(resolve_gauges(PROFILE))}
+
+        def publish() -> bool:
+            return publish_sample(
+                sender,
+                PROFILE,
+                estimators,
+                "health",
+                "scene",
+                {"scene": frame.image},
+                "scene",
+                frame_valid=lambda: reader.is_valid(frame),
+            )
+
+        assert publish() is True
+        assert sender.sent[-1]["health_percent"] == 44
+
+        writer.publish(image)
+        writer.publish(image)  # two slots: the frame's slot is now reused
+        assert publish() is False
+        assert len(sender.sent) == 1
+    finally:
+        frame = None  # release the zero-copy view before closing the mapping
+        reader.close()
+        writer.close()
+        writer.unlink()
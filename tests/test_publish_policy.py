@@ -0,0 +1,37 @@
+from examples.publish_policy import DeltaPublishPolicy
+
+
+def _payload(health=80, visible=True, confidence=0.9, armor=40):
+    return {
+        "health_percent": health,
+        "hud_anchor_visible": visible,
+        "confidence": confidence,
+        "gauges": {"health": {"value": health}, "armor": {"value": armor}},
+    }
+
+
+def test_first_sample_is_sent_and_repeats_are_suppressed():
+    policy = DeltaPublishPolicy(heartbeat_ms=250)
+    assert policy.decide(_payload(), 0) == "sample"
+    assert policy.decide(_payload(), 100) == "suppress"
+    assert policy.decide(_payload(confidence=0.93), 200) == "suppress"
+    assert policy.counters() == {"sent": 1, "heartbeats": 0, "suppressed": 2}
+
+
+def test_any_state_change_is_sent_immediately():
+    policy = DeltaPublishPolicy()
+    policy.decide(_payload(), 0)
+    assert policy.decide(_payload(health=79), 10) == "sample"
+    assert policy.decide(_payload(health=79, visible=False), 20) == "sample"
+    assert policy.decide(_payload(health=79, visible=False, armor=10), 30) == "sample"
+    assert policy.decide(_payload(health=79, visible=False, armor=10, confidence=0.5), 40) == "sample"
+
+
+def test_heartbeat_after_interval_without_change():
+    policy = DeltaPublishPolicy(heartbeat_ms=250)
+    policy.decide(_payload(), 0)
+    assert policy.decide(_payload(), 249) == "suppress"
+    assert policy.decide(_payload(), 250) == "heartbeat"
+    assert policy.decide(_payload(), 400) == "suppress"
+    assert policy.decide(_payload(), 500) == "heartbeat"
+    assert policy.counters() == {"sent": 1, "heartbeats": 2, "suppressed": 2}